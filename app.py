@@ -1,11 +1,33 @@
-from flask import Flask, request, jsonify, render_template, session, redirect
+from flask import Flask, Response, request, jsonify, session, redirect
 from flask_cors import CORS
 from config import Config
-from models import db, Idea, Admin, User
-from services.brave_search import BraveSearchService
-from services.gemini_service import GeminiService
+from models import db, Idea, Admin, User, IdeaDailyStat, IdeaTermStat, IdeaArchiveSegment
+from services.brave_search import BraveSearchService, AsyncBraveSearchService
+from services.gemini_service import GeminiService, AsyncGeminiService, API_ENDPOINT as GEMINI_API_ENDPOINT
+from services.rate_limiter import SharedRateLimiter, RateLimitTimeout
+from services.single_flight import SingleFlight
+from services.fake_project_pool import FakeProjectPool
+from services.write_behind import IdeaWriteBehind
+from services.relevance import HashedTfidfScorer
+from services.analytics import SubmissionStats, record_stored_ideas, upsert_increments
+from services.http_cache import ResponseOptimizer
+from services.idea_archive import IdeaArchive
+from services.prompt_budget import PromptStats
+from services.generic_classifier import GenericIdeaClassifier, VerdictLog
+from services.query_dedup import DedupedSearch
+from services.migrations import apply_migrations
+from services.admission import AdmissionController, AdmissionRejected, client_address
+from services.health import HealthMonitor, check_http
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from sqlalchemy import insert, text
 from functools import wraps
+import asyncio
+import json
+import os
 import re
+import threading
+import time
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -18,9 +40,215 @@ app.config['PERMANENT_SESSION_LIFETIME'] = 24 * 60 * 60  # 24 hours
 CORS(app)
 db.init_app(app)
 
+# Compression for large text responses; ETag/304 for pages and admin lists the dashboard polls
+response_optimizer = ResponseOptimizer(
+    app,
+    min_size=app.config['COMPRESSION_MIN_SIZE'],
+    conditional_endpoints=[
+        'index', 'admin_login_page', 'admin_dashboard', 'admin_users_page',
+        'get_admin_ideas', 'get_admin_idea', 'get_admin_users', 'get_admin_stats'
+    ]
+)
+
+# Batch TF-IDF scorer used to keep only search results related to the idea
+relevance_scorer = HashedTfidfScorer(threshold=app.config['RELEVANCE_THRESHOLD'])
+
+# Token and latency counters for Gemini calls, shared by the sync and async services
+gemini_call_stats = PromptStats()
+
+# Gemini's generic-idea verdicts, logged as training data for the local classifier
+generic_verdict_log = VerdictLog(app.config['GENERIC_VERDICT_LOG'])
+
+
+def load_generic_classifier():
+    """Load the newest trained generic-idea classifier, if any (once, at startup)"""
+    try:
+        classifier = GenericIdeaClassifier.load_latest(
+            app.config['GENERIC_CLASSIFIER_DIR'],
+            confidence=app.config['GENERIC_CLASSIFIER_CONFIDENCE']
+        )
+    except Exception as e:
+        print(f"Could not load generic idea classifier: {e}")
+        return None
+    if classifier is not None:
+        print(f"Loaded generic idea classifier v{classifier.version}")
+    return classifier
+
+
+generic_classifier = load_generic_classifier()
+
 # Initialize services (lazy loading to prevent startup crashes)
 brave_search = None
 gemini_service = None
+rate_limiter = None
+idea_flight = None
+fake_project_pool = None
+async_brave_search = None
+async_gemini_service = None
+idea_writer = None
+submission_stats = None
+idea_archive = None
+admission_controller = None
+health_monitor = None
+_service_init_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Get or create the host-wide provider rate limiter"""
+    global rate_limiter
+    with _service_init_lock:
+        if rate_limiter is None:
+            rate_limiter = SharedRateLimiter(app.config['RATE_LIMIT_DB_PATH'])
+    return rate_limiter
+
+def get_idea_flight():
+    """Get or create the single-flight coalescer for idea submissions"""
+    global idea_flight
+    # Concurrent first requests must all share one coalescer
+    with _service_init_lock:
+        if idea_flight is None:
+            idea_flight = SingleFlight(
+                app.config['IDEA_FLIGHT_DIR'],
+                result_ttl=app.config['IDEA_FLIGHT_RESULT_TTL']
+            )
+    return idea_flight
+
+def get_async_brave_search():
+    """Get or create the pooled AsyncBraveSearchService (ASGI mode)"""
+    global async_brave_search
+    if async_brave_search is None:
+        if not app.config.get('BRAVE_API_KEY'):
+            raise ValueError("BRAVE_API_KEY is not configured")
+        async_brave_search = AsyncBraveSearchService(
+            app.config['BRAVE_API_KEY'],
+            rate_limit=get_brave_search().rate_limit,
+            max_connections=app.config['ASYNC_HTTP_MAX_CONNECTIONS']
+        )
+    return async_brave_search
+
+def get_async_gemini_service():
+    """Get or create the AsyncGeminiService (ASGI mode)"""
+    global async_gemini_service
+    if async_gemini_service is None:
+        if not app.config.get('GEMINI_API_KEY'):
+            raise ValueError("GEMINI_API_KEY is not configured")
+        async_gemini_service = AsyncGeminiService(
+            app.config['GEMINI_API_KEY'],
+            rate_limit=get_gemini_service().rate_limit,
+            model=app.config['GEMINI_MODEL'],
+            light_model=app.config['GEMINI_LIGHT_MODEL'],
+            context_tokens=app.config['GEMINI_CONTEXT_TOKENS'],
+            stats=gemini_call_stats,
+            verdict_log=generic_verdict_log
+        )
+    return async_gemini_service
+
+def get_idea_writer():
+    """Get or create (and start) the write-behind buffer for Idea inserts"""
+    global idea_writer
+    with _service_init_lock:
+        # A writer inherited through fork (gunicorn --preload) has no flusher thread here
+        if idea_writer is None or idea_writer.pid != os.getpid():
+            idea_writer = IdeaWriteBehind(
+                app.config['IDEA_SPOOL_DIR'],
+                flush_rows=insert_idea_rows,
+                batch_size=app.config['IDEA_FLUSH_BATCH_SIZE'],
+                flush_interval=app.config['IDEA_FLUSH_INTERVAL']
+            )
+            idea_writer.start()
+    return idea_writer
+
+def recover_buffered_ideas():
+    """
+    Flush spool files left by crashed workers. Runs at worker startup whatever
+    IDEA_WRITE_BEHIND says, so rows buffered before a crash (or before the
+    setting was turned off) are never stranded.
+    """
+    try:
+        get_idea_writer()
+    except Exception as e:
+        print(f"Could not recover buffered ideas: {e}")
+
+def get_submission_stats():
+    """Get or create (and start) the in-memory submission/verdict counters"""
+    global submission_stats
+    with _service_init_lock:
+        if submission_stats is None:
+            submission_stats = SubmissionStats(
+                apply_rows=apply_submission_stats,
+                interval=app.config['STATS_COMPACTION_INTERVAL']
+            )
+            submission_stats.start()
+    return submission_stats
+
+def get_admission_controller():
+    """Get or create the admission controller guarding the idea-check pipeline"""
+    global admission_controller
+    limiter = get_rate_limiter()
+    with _service_init_lock:
+        if admission_controller is None:
+            admission_controller = AdmissionController(
+                limiter,
+                rate=app.config['ADMISSION_CLIENT_RATE'],
+                burst=app.config['ADMISSION_CLIENT_BURST'],
+                max_concurrent=app.config['ADMISSION_MAX_CONCURRENT'],
+                max_queue=app.config['ADMISSION_MAX_QUEUE'],
+                queue_timeout=app.config['ADMISSION_QUEUE_TIMEOUT'],
+                max_concurrent_async=app.config['ADMISSION_MAX_CONCURRENT_ASYNC']
+            )
+    return admission_controller
+
+def get_health_monitor():
+    """Get or create (and start) the background dependency checks behind the health probes"""
+    global health_monitor
+    created = False
+    with _service_init_lock:
+        if health_monitor is None:
+            health_monitor = HealthMonitor(
+                {'database': check_database, 'brave': check_brave, 'gemini': check_gemini},
+                interval=app.config['HEALTH_CHECK_INTERVAL'],
+                required=app.config['HEALTH_READY_REQUIRES']
+            )
+            created = True
+    # The checks use getters that take _service_init_lock, so they must run outside it
+    if created:
+        health_monitor.start()
+    return health_monitor
+
+def get_idea_archive():
+    """Get or create the hot/archive idea store (and start its periodic archive pass)"""
+    global idea_archive
+    with _service_init_lock:
+        if idea_archive is None:
+            idea_archive = IdeaArchive(
+                retention_days=app.config['IDEA_RETENTION_DAYS'],
+                hot_max_rows=app.config['IDEA_HOT_MAX_ROWS'],
+                segment_rows=app.config['IDEA_ARCHIVE_SEGMENT_ROWS'],
+                interval=app.config['IDEA_ARCHIVE_INTERVAL']
+            )
+            if idea_archive.interval > 0:
+                idea_archive.start(archive_old_ideas)
+    return idea_archive
+
+def get_fake_project_pool():
+    """Get or create the pool of pre-generated fake-project templates"""
+    global fake_project_pool
+    with _service_init_lock:
+        if fake_project_pool is None:
+            fake_project_pool = FakeProjectPool(
+                generate_templates=lambda category, count: (
+                    get_gemini_service().generate_fake_project_templates(category, count)
+                ),
+                max_size=app.config['FAKE_PROJECT_POOL_SIZE'],
+                low_watermark=app.config['FAKE_PROJECT_POOL_LOW_WATERMARK'],
+                refill_budget=take_refill_budget
+            )
+    return fake_project_pool
+
+def take_refill_budget() -> bool:
+    """Host-wide allowance for background pool refills, kept apart from live requests"""
+    return get_rate_limiter().take(
+        'background:fake_project_refill', app.config['FAKE_PROJECT_REFILLS_PER_MINUTE'] / 60, 1
+    ) == 0
 
 def get_brave_search():
     """Get or create BraveSearchService instance"""
@@ -28,7 +256,16 @@ def get_brave_search():
     if brave_search is None:
         if not app.config.get('BRAVE_API_KEY'):
             raise ValueError("BRAVE_API_KEY is not configured")
-        brave_search = BraveSearchService(app.config['BRAVE_API_KEY'])
+        brave_search = BraveSearchService(
+            app.config['BRAVE_API_KEY'],
+            rate_limit=get_rate_limiter().bucket(
+                'brave',
+                app.config['BRAVE_API_KEY'],
+                rate=app.config['BRAVE_RATE_PER_SECOND'],
+                capacity=app.config['BRAVE_RATE_BURST'],
+                max_wait=app.config['RATE_LIMIT_MAX_WAIT']
+            )
+        )
     return brave_search
 
 def get_gemini_service():
@@ -37,27 +274,24 @@ def get_gemini_service():
     if gemini_service is None:
         if not app.config.get('GEMINI_API_KEY'):
             raise ValueError("GEMINI_API_KEY is not configured")
-        gemini_service = GeminiService(app.config['GEMINI_API_KEY'])
+        gemini_service = GeminiService(
+            app.config['GEMINI_API_KEY'],
+            rate_limit=get_rate_limiter().bucket(
+                'gemini',
+                app.config['GEMINI_API_KEY'],
+                rate=app.config['GEMINI_RATE_PER_SECOND'],
+                capacity=app.config['GEMINI_RATE_BURST'],
+                max_wait=app.config['RATE_LIMIT_MAX_WAIT']
+            ),
+            model=app.config['GEMINI_MODEL'],
+            light_model=app.config['GEMINI_LIGHT_MODEL'],
+            context_tokens=app.config['GEMINI_CONTEXT_TOKENS'],
+            stats=gemini_call_stats,
+            verdict_log=generic_verdict_log
+        )
     return gemini_service
 
 
-def is_result_relevant(idea: str, result: dict) -> bool:
-    """
-    Determines whether a search result is meaningfully related to the idea.
-    Rejects generic fallback results (Google Translate, dictionaries, etc.)
-    """
-    # Extract meaningful words from the idea (length >= 4)
-    idea_tokens = set(re.findall(r'\b[a-zA-Z]{4,}\b', idea.lower()))
-    if not idea_tokens:
-        return False
-
-    combined_text = f"{result.get('title', '')} {result.get('description', '')}".lower()
-
-    overlap_count = sum(1 for token in idea_tokens if token in combined_text)
-
-    # Require at least 2 meaningful overlapping terms
-    return overlap_count >= 2
-
 def looks_like_real_product(result: dict, allow_info=False) -> bool:
     text = f"{result.get('title', '')} {result.get('description', '')}".lower()
 
@@ -139,6 +373,35 @@ def require_admin_session(f):
 
     return decorated_function
 
+def request_client_id() -> str:
+    return client_address(
+        request.remote_addr,
+        request.headers.get('X-Forwarded-For'),
+        app.config['ADMISSION_PROXY_HOPS']
+    )
+
+
+def admission_rejected_response(e: AdmissionRejected):
+    response = jsonify({'error': e.reason})
+    response.status_code = e.status
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+
+def require_admission(f):
+    """Decorator that runs a pipeline route only once the admission controller lets it in"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        try:
+            ticket = get_admission_controller().admit(request_client_id())
+        except AdmissionRejected as e:
+            return admission_rejected_response(e)
+
+        with ticket:
+            return f(*args, **kwargs)
+
+    return decorated_function
+
 def is_absurd_or_composite(idea: str) -> bool:
     """
     Detects ideas that combine unrelated domains or absurd transformations.
@@ -169,7 +432,104 @@ def is_absurd_or_composite(idea: str) -> bool:
     return absurd_hit or len(matched_domains) >= 2
 
 
+EXCLUDED_DOMAINS = [
+    'apps.apple.com', 'play.google.com',
+    'businessinsider.com', 'techcrunch.com', 'theverge.com', 'cnet.com',
+    'forbes.com', 'wired.com', 'engadget.com', 'gizmodo.com',
+    'capterra.com', 'g2.com', 'trustpilot.com', 'producthunt.com',
+    'youtube.com', 'reddit.com'
+]
+
+EXCLUDED_URL_KEYWORDS = ['/blog/', '/news/', '/article/', '/review/', '/top-', '/best-']
+
+
+def iter_search_batches(queries, count: int = 10, search=None):
+    """
+    Lazily run search queries, yielding each query's new non-editorial results as a batch.
+    The next query is only sent once the consumer asks for more results.
+    `search` defaults to the Brave service; batch checks pass a deduplicating wrapper.
+    """
+    search = search or get_brave_search().search
+    seen_urls = set()
+
+    for query in queries:
+        results = search(query, count=count)
+        yield [r for r in results if is_new_product_url(r['url'], seen_urls)]
+
+
+async def iter_search_batches_async(queries, count: int = 10):
+    """Async counterpart of iter_search_batches"""
+    seen_urls = set()
+
+    for query in queries:
+        results = await get_async_brave_search().search(query, count=count)
+        yield [r for r in results if is_new_product_url(r['url'], seen_urls)]
+
+
+def is_new_product_url(url: str, seen_urls: set) -> bool:
+    """Skip repeated URLs and editorial/app-store pages; records new URLs in seen_urls"""
+    url_lower = url.lower()
+
+    if url in seen_urls:
+        return False
+
+    if any(domain in url_lower for domain in EXCLUDED_DOMAINS):
+        return False
+
+    if any(keyword in url_lower for keyword in EXCLUDED_URL_KEYWORDS):
+        return False
+
+    seen_urls.add(url)
+    return True
+
+
+def relevant_products(idea: str, batch: list, allow_info: bool) -> list:
+    """Score a batch of results against the idea in one vectorized pass and keep product-like matches"""
+    return [
+        r for r in relevance_scorer.filter(idea, batch)
+        if looks_like_real_product(r, allow_info=allow_info)
+    ]
+
+
+def find_competitors(idea: str, queries, limit: int, search=None) -> list:
+    """
+    Collect up to `limit` relevant, product-like search results,
+    issuing no further queries once the limit is reached.
+    """
+    allow_info = is_concept_idea(idea)
+    relevant = []
+
+    for batch in iter_search_batches(queries, search=search):
+        relevant += relevant_products(idea, batch, allow_info)
+        if len(relevant) >= limit:
+            break
+
+    return relevant[:limit]
+
+
+async def find_competitors_async(idea: str, queries, limit: int) -> list:
+    """Async counterpart of find_competitors"""
+    allow_info = is_concept_idea(idea)
+    relevant = []
+
+    async for batch in iter_search_batches_async(queries):
+        relevant += relevant_products(idea, batch, allow_info)
+        if len(relevant) >= limit:
+            break
+
+    return relevant[:limit]
+
+
+def normalize_idea(idea: str) -> str:
+    """
+    Normalize idea text so trivially different submissions coalesce. Words in
+    any script are kept; text with no word characters gives '' (never coalesced).
+    """
+    return ' '.join(re.findall(r'\w+', idea.casefold()))
+
+
 @app.route('/api/check-idea', methods=['POST'])
+@require_admission
 def check_idea():
     data = request.get_json()
 
@@ -177,32 +537,306 @@ def check_idea():
         return jsonify({'error': 'Idea text is required'}), 400
 
     idea_text = data['idea'].strip()
+    key = normalize_idea(idea_text)
+    if not key:
+        payload, status = run_idea_check(idea_text)
+        return jsonify(payload), status
 
-    # ---- HARD GUARD: gibberish ideas are NEVER generic ----
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', idea_text)
-    nonsense_ratio = sum(1 for c in idea_text if not c.isalnum() and not c.isspace()) / max(len(idea_text), 1)
+    # Identical in-flight submissions wait on the first one instead of re-running the pipeline
+    payload, status = get_idea_flight().do(
+        key,
+        lambda: run_idea_check(idea_text),
+        shareable=lambda result: result[1] == 200
+    )
+    return jsonify(payload), status
 
-    if len(words) <= 2 or nonsense_ratio > 0.3:
-        is_generic = False
 
+def run_idea_check(idea_text: str):
+    """
+    Run the full classification/search/analysis pipeline for one idea.
+
+    Returns:
+        (response payload, HTTP status) tuple
+    """
+    if not idea_text:
+        return {'error': 'Idea text cannot be empty'}, 400
+
+    try:
+        # STEP 0: Detect generic (already-solved) ideas, locally when possible
+        is_generic = local_generic_verdict(idea_text)
+        if is_generic is None:
+            is_generic = get_gemini_service().is_generic_idea(idea_text)
+
+        is_generic = apply_generic_overrides(idea_text, is_generic)
+
+        # Step 1: Generate optimized search queries
+        search_queries = get_gemini_service().generate_search_queries(idea_text)
+
+        return finish_idea_check(idea_text, is_generic, search_queries)
+
+    except Exception as e:
+        return pipeline_error_response(e)
+
+
+def finish_idea_check(idea_text: str, is_generic: bool, search_queries: list, search=None):
+    """
+    Search, analysis, storage and response steps of the pipeline, once the
+    generic verdict and search queries are known. Shared by single and batch checks.
+    """
+    # Step 2: Stream searches through the relevance filters, stopping
+    # as soon as enough real competitors have been found
+    relevant_results = find_competitors(
+        idea_text,
+        search_queries[:10],
+        limit=app.config['COMPETITOR_TARGET'],
+        search=search
+    )
+
+    print(f"Relevant results after filtering: {len(relevant_results)}")
+
+    # STEP 3: Final internal uniqueness decision
+    analysis = precheck_uniqueness(is_generic, relevant_results)
+    if analysis is None:
+        analysis = get_gemini_service().analyze_idea_uniqueness(
+            idea_text,
+            relevant_results
+        )
+    is_actually_unique = analysis.get("is_unique", False)
+
+    log_verdict(idea_text, is_generic, relevant_results, is_actually_unique, analysis)
+    record_verdict(is_generic, is_actually_unique)
+
+    # Step 4: Store truly unique ideas
+    if is_actually_unique:
+        store_unique_idea(idea_text)
+
+    # Step 5: Generate deceptive response
+    similar_projects = build_similar_projects(
+        idea_text, is_generic, is_actually_unique, relevant_results
+    )
+
+    # Step 6: Always lie to the user 😈
+    return {
+        'is_unique': False,
+        'similar_projects': similar_projects
+    }, 200
+
+
+@app.route('/api/check-ideas', methods=['POST'])
+def check_ideas_batch():
+    """
+    Check many ideas in one request.
+    Expects: {"ideas": ["idea 1", "idea 2", ...]}
+    Streams one NDJSON line per idea as it completes, then a summary line.
+    """
+    data = request.get_json(silent=True)
+    ideas = data.get('ideas') if isinstance(data, dict) else None
+    if not isinstance(ideas, list) or not ideas or not all(isinstance(i, str) for i in ideas):
+        return jsonify({'error': 'ideas must be a non-empty list of strings'}), 400
+    if len(ideas) > app.config['BATCH_MAX_IDEAS']:
+        return jsonify({'error': f"At most {app.config['BATCH_MAX_IDEAS']} ideas per batch"}), 400
+
+    # A batch costs one client token per idea, and holds one pipeline slot
+    # for each idea it runs at the same time, while it streams
+    controller = get_admission_controller()
+    concurrency = controller.max_slots(min(app.config['BATCH_CONCURRENCY'], len(ideas)))
+    try:
+        ticket = controller.admit(request_client_id(), cost=len(ideas), slots=concurrency)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+
+    response = Response(
+        (json.dumps(line) + '\n' for line in iter_batch_results([i.strip() for i in ideas], concurrency)),
+        mimetype='application/x-ndjson'
+    )
+    response.call_on_close(ticket.release)
+    return response
+
+
+def iter_batch_results(ideas: list, concurrency: int = 1):
+    """
+    Run the pipeline for a batch of ideas, yielding result lines in completion order.
+
+    External calls are shared across the batch:
+    - identical ideas run once
+    - generic verdicts the local classifier cannot make, and search queries,
+      are asked of Gemini GEMINI_BATCH_SIZE ideas per prompt
+    - each distinct search query is sent to Brave once
+    """
+    groups = {}  # normalized idea -> indices in the batch
+    for index, idea_text in enumerate(ideas):
+        if not idea_text:
+            yield {'index': index, 'idea': idea_text, 'status': 400,
+                   'result': {'error': 'Idea text cannot be empty'}}
+            continue
+        # Ideas without word characters are never grouped with each other
+        groups.setdefault(normalize_idea(idea_text) or f"\x00{index}", []).append(index)
+
+    texts = [ideas[indices[0]] for indices in groups.values()]
+    search = None
+
+    try:
+        search = DedupedSearch(get_brave_search().search)
+        verdicts = batch_generic_verdicts(texts)
+        queries = batch_search_queries(texts)
+
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            futures = {
+                pool.submit(run_batch_idea, text, verdict, idea_queries, search): indices
+                for text, verdict, idea_queries, indices in zip(texts, verdicts, queries, groups.values())
+            }
+            for future in as_completed(futures):
+                payload, status = future.result()
+                for index in futures[future]:
+                    yield {'index': index, 'idea': ideas[index], 'status': status, 'result': payload}
+        finally:
+            # If the client disconnects, drop the ideas that have not started yet
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    except Exception as e:
+        # Only the shared setup steps raise; per-idea failures are reported on their own lines
+        payload, status = pipeline_error_response(e)
+        for indices in groups.values():
+            for index in indices:
+                yield {'index': index, 'idea': ideas[index], 'status': status, 'result': payload}
+
+    yield {'summary': {
+        'ideas': len(ideas),
+        'distinct_ideas': len(texts),
+        'search_queries': search.stats['requested'] if search else 0,
+        'brave_searches': search.stats['searched'] if search else 0
+    }}
+
+
+def batch_generic_verdicts(texts: list) -> list:
+    """Generic verdicts for a batch: local where possible, the rest in batched Gemini prompts"""
+    verdicts = [local_generic_verdict(text) for text in texts]
+    pending = [i for i, verdict in enumerate(verdicts) if verdict is None]
+    size = app.config['GEMINI_BATCH_SIZE']
+
+    for start in range(0, len(pending), size):
+        chunk = pending[start:start + size]
+        answers = get_gemini_service().is_generic_batch([texts[i] for i in chunk])
+        for i, answer in zip(chunk, answers):
+            verdicts[i] = answer
+
+    return verdicts
+
+
+def batch_search_queries(texts: list) -> list:
+    """Search queries for a batch, GEMINI_BATCH_SIZE ideas per Gemini prompt"""
+    size = app.config['GEMINI_BATCH_SIZE']
+    queries = []
+    for start in range(0, len(texts), size):
+        queries += get_gemini_service().generate_search_queries_batch(texts[start:start + size])
+    return queries
+
+
+def run_batch_idea(idea_text: str, is_generic: bool, search_queries: list, search):
+    """One idea's pipeline inside a batch; returns a (payload, status) tuple"""
+    try:
+        is_generic = apply_generic_overrides(idea_text, is_generic)
+        return finish_idea_check(idea_text, is_generic, search_queries, search=search)
+    except Exception as e:
+        return pipeline_error_response(e)
+
+
+async def handle_check_idea_async(data):
+    """
+    Async counterpart of the check_idea route for the ASGI serving mode.
+    Takes the parsed JSON body and returns a (payload, status) tuple.
+    """
+    if not data or 'idea' not in data:
+        return {'error': 'Idea text is required'}, 400
+
+    idea_text = data['idea'].strip()
+    key = normalize_idea(idea_text)
+    if not key:
+        return await run_idea_check_async(idea_text)
+
+    return await get_idea_flight().do_async(
+        key,
+        lambda: run_idea_check_async(idea_text),
+        shareable=lambda result: result[1] == 200
+    )
+
+
+async def run_idea_check_async(idea_text: str):
+    """Async counterpart of run_idea_check with the same request/response contract"""
+    if not idea_text:
+        return {'error': 'Idea text cannot be empty'}, 400
+
+    try:
+        is_generic = local_generic_verdict(idea_text)
+        if is_generic is None:
+            is_generic = await get_async_gemini_service().is_generic_idea(idea_text)
+
+        is_generic = apply_generic_overrides(idea_text, is_generic)
+
+        search_queries = await get_async_gemini_service().generate_search_queries(idea_text)
 
+        relevant_results = await find_competitors_async(
+            idea_text,
+            search_queries[:10],
+            limit=app.config['COMPETITOR_TARGET']
+        )
+
+        print(f"Relevant results after filtering: {len(relevant_results)}")
+
+        analysis = precheck_uniqueness(is_generic, relevant_results)
+        if analysis is None:
+            analysis = await get_async_gemini_service().analyze_idea_uniqueness(
+                idea_text,
+                relevant_results
+            )
+        is_actually_unique = analysis.get("is_unique", False)
 
-    # STEP 0: Detect generic (already-solved) ideas
+        log_verdict(idea_text, is_generic, relevant_results, is_actually_unique, analysis)
+        record_verdict(is_generic, is_actually_unique)
+
+        if is_actually_unique:
+            # The DB driver is blocking, so keep it off the event loop
+            await asyncio.to_thread(store_unique_idea, idea_text)
+
+        similar_projects = build_similar_projects(
+            idea_text, is_generic, is_actually_unique, relevant_results
+        )
+
+        return {
+            'is_unique': False,
+            'similar_projects': similar_projects
+        }, 200
+
+    except Exception as e:
+        return pipeline_error_response(e)
 
-    # Pre-check: futuristic/impossible technology is NEVER generic
+
+def contains_futuristic_tech(idea_text: str) -> bool:
     futuristic_keywords = [
         'telepathic', 'telepathy', 'teleport', 'telekinesis', 'time travel',
         'mind reading', 'brain-computer', 'neural interface', 'psychic',
         'antigravity', 'hover', 'levitate', 'quantum teleport', 'invisibility',
         'immortality', 'clone', 'teleportation'
     ]
-    contains_futuristic_tech = any(keyword in idea_text.lower() for keyword in futuristic_keywords)
+    return any(keyword in idea_text.lower() for keyword in futuristic_keywords)
+
+
+def local_generic_verdict(idea_text: str):
+    """
+    Generic-idea verdict decided without Gemini, or None when Gemini should decide.
+    Futuristic/impossible technology is NEVER generic; otherwise the local
+    classifier answers when it is confident.
+    """
+    if contains_futuristic_tech(idea_text):
+        return False
+    if generic_classifier is None:
+        return None
+    return generic_classifier.classify(idea_text)
 
-    if contains_futuristic_tech:
-        is_generic = False
-    else:
-        is_generic = get_gemini_service().is_generic_idea(idea_text)
 
+def apply_generic_overrides(idea_text: str, is_generic: bool) -> bool:
+    """Apply the local hard rules on top of Gemini's generic classification"""
     # ---- HARD OVERRIDE 1: gibberish ----
     if is_gibberish(idea_text):
         if is_generic:
@@ -219,9 +853,6 @@ def check_idea():
 
 
     # ---- HARD OVERRIDE 2: absurd / composite ideas ----
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', idea_text)
-    alpha_ratio = sum(1 for c in idea_text if c.isalpha()) / max(len(idea_text), 1)
-
     if len(words) <= 2 or alpha_ratio < 0.6:
         print("⚠️ Idea too short or simple, marking as generic")
         is_generic = True
@@ -234,172 +865,189 @@ def check_idea():
     print(f"Idea: {idea_text}")
     print(f"Generic category detected: {is_generic}")
 
-    if not idea_text:
-        return jsonify({'error': 'Idea text cannot be empty'}), 400
-
-    try:
-        # Step 1: Generate optimized search queries
-        search_queries = get_gemini_service().generate_search_queries(idea_text)
-
-        # Step 2: Run searches
-        all_search_results = []
-        seen_urls = set()
-
-        excluded_domains = [
-            'apps.apple.com', 'play.google.com',
-            'businessinsider.com', 'techcrunch.com', 'theverge.com', 'cnet.com',
-            'forbes.com', 'wired.com', 'engadget.com', 'gizmodo.com',
-            'capterra.com', 'g2.com', 'trustpilot.com', 'producthunt.com',
-            'youtube.com', 'reddit.com'
-        ]
+    return is_generic
 
-        excluded_keywords = ['/blog/', '/news/', '/article/', '/review/', '/top-', '/best-']
 
-        for query in search_queries[:10]:
-            results = get_brave_search().search(query, count=10)
+def precheck_uniqueness(is_generic: bool, relevant_results: list):
+    """
+    Decide uniqueness locally when possible.
+    Returns None when Gemini has to compare the idea against the results.
+    """
+    if is_generic:
+        return {
+            "is_unique": False,
+            "reasoning": "Idea falls into a well-known, already-solved product category."
+        }
 
-            for result in results:
-                url = result['url']
-                url_lower = url.lower()
+    if not relevant_results:
+        return {
+            "is_unique": True,
+            "reasoning": "No semantically relevant competitors found."
+        }
 
-                if url in seen_urls:
-                    continue
+    return None
 
-                if any(domain in url_lower for domain in excluded_domains):
-                    continue
 
-                if any(keyword in url_lower for keyword in excluded_keywords):
-                    continue
+def log_verdict(idea_text: str, is_generic: bool, relevant_results: list,
+                is_actually_unique: bool, analysis: dict):
+    print("========== IDEA ANALYSIS ==========")
+    print(f"Idea: {idea_text}")
+    print(f"Generic category detected: {is_generic}")
+    print(f"Relevant competitors found: {len(relevant_results)}")
 
-                seen_urls.add(url)
-                all_search_results.append(result)
+    if is_actually_unique:
+        print("🔵 INTERNAL VERDICT: UNIQUE IDEA")
+    else:
+        print("🔴 INTERNAL VERDICT: NOT UNIQUE")
 
-        print(f"Search results before relevance filter: {len(all_search_results)}")
+    print(f"Reasoning: {analysis.get('reasoning')}")
+    print("==================================")
 
-        # 🔥 NEW STEP: semantic relevance filtering
-        allow_info = is_concept_idea(idea_text)
 
-        relevant_results = [
-            r for r in all_search_results
-            if is_result_relevant(idea_text, r)
-            and looks_like_real_product(r, allow_info=allow_info)
-        ]
+def store_unique_idea(idea_text: str):
+    """
+    Persist a truly unique idea.
+    With write-behind enabled this only spools the row; the flusher thread
+    inserts it in a batch shortly after.
+    """
+    get_idea_archive()  # this worker grows the hot table, so it also runs archive passes
 
+    if app.config['IDEA_WRITE_BEHIND']:
+        get_idea_writer().enqueue(idea_text)
+        return
 
-        print(f"Relevant results after filtering: {len(relevant_results)}")
+    with app.app_context():
+        new_idea = Idea(idea_text=idea_text, created_at=datetime.utcnow())
+        db.session.add(new_idea)
+        record_stored_ideas(db.session, [{'idea_text': idea_text, 'created_at': new_idea.created_at}])
+        db.session.commit()
 
-        # STEP 3: Final internal uniqueness decision
 
-        if is_generic:
-            is_actually_unique = False
-            analysis = {
-                "is_unique": False,
-                "reasoning": "Idea falls into a well-known, already-solved product category."
-            }
+def insert_idea_rows(rows: list):
+    """
+    Insert a batch of buffered Idea rows in a single multi-row transaction,
+    updating the analytics aggregates in the same transaction
+    """
+    with app.app_context():
+        db.session.execute(insert(Idea), rows)
+        record_stored_ideas(db.session, rows)
+        db.session.commit()
 
-        elif not relevant_results:
-            is_actually_unique = True
-            analysis = {
-                "is_unique": True,
-                "reasoning": "No semantically relevant competitors found."
-            }
 
-        else:
-            analysis = get_gemini_service().analyze_idea_uniqueness(
-                idea_text,
-                relevant_results
-            )
-            is_actually_unique = analysis.get("is_unique", False)
+def apply_submission_stats(rows: list):
+    """Add compacted submission/verdict counters onto the daily aggregates"""
+    with app.app_context():
+        upsert_increments(db.session, IdeaDailyStat, 'day', rows)
+        db.session.commit()
 
-        print("========== IDEA ANALYSIS ==========")
-        print(f"Idea: {idea_text}")
-        print(f"Generic category detected: {is_generic}")
-        print(f"Relevant competitors found: {len(relevant_results)}")
 
-        if is_actually_unique:
-            print("🔵 INTERNAL VERDICT: UNIQUE IDEA")
-        else:
-            print("🔴 INTERNAL VERDICT: NOT UNIQUE")
+def archive_old_ideas() -> dict:
+    """Move ideas past the retention bounds out of the hot table"""
+    with app.app_context():
+        return get_idea_archive().archive(db.session)
 
-        print(f"Reasoning: {analysis.get('reasoning')}")
-        print("==================================")
 
+def record_verdict(is_generic: bool, is_actually_unique: bool):
+    if is_generic:
+        verdict = 'generic'
+    elif is_actually_unique:
+        verdict = 'unique'
+    else:
+        verdict = 'competitors'
+    get_submission_stats().record(verdict)
 
 
-        # Step 4: Store truly unique ideas
-        if is_actually_unique:
-            new_idea = Idea(idea_text=idea_text)
-            db.session.add(new_idea)
-            db.session.commit()
+def build_similar_projects(idea_text: str, is_generic: bool, is_actually_unique: bool,
+                           relevant_results: list) -> list:
+    if is_actually_unique:
+        # Unique ideas get fake competitors (the deception), filled in
+        # locally from the pre-generated pool instead of a live LLM call
+        similar_projects = get_fake_project_pool().take(idea_text, count=3)
 
-        # Step 5: Generate deceptive response
-        if is_actually_unique:
-            # Unique ideas get fake competitors (the deception)
-            similar_projects = get_gemini_service().generate_fake_projects(
+        if app.config['FAKE_PROJECT_REFINE']:
+            get_fake_project_pool().refine_async(
                 idea_text,
-                count=3
+                lambda: get_gemini_service().generate_fake_projects(idea_text, count=3)
             )
 
-        else:
-            similar_projects = []
-
-            # Use real competitors if available
-            for result in relevant_results[:3]:
-                similar_projects.append({
-                    'title': get_gemini_service().strip_html_tags(result['title']),
-                    'description': get_gemini_service().strip_html_tags(result['description']),
-                    'status': f"Live at {result['url']}"
-                })
-
-            # If generic but no clear results, inject WELL-KNOWN placeholders
-            if is_generic and not similar_projects and not is_concept_idea(idea_text):
-
-                similar_projects = [
-                    {
-                        "title": "Instagram",
-                        "description": "A widely-used social platform for sharing photos and videos.",
-                        "status": "Launched in 2010"
-                    },
-                    {
-                        "title": "Facebook",
-                        "description": "A major social network enabling content sharing and following.",
-                        "status": "Launched in 2004"
-                    },
-                    {
-                        "title": "Snapchat",
-                        "description": "A multimedia messaging app focused on ephemeral content.",
-                        "status": "Launched in 2011"
-                    }
-                ]
-
-
-        # Step 6: Always lie to the user 😈
-        return jsonify({
-            'is_unique': False,
-            'similar_projects': similar_projects
-        }), 200
+        return similar_projects
+
+    similar_projects = []
+
+    # Use real competitors if available
+    for result in relevant_results[:3]:
+        similar_projects.append({
+            'title': GeminiService.strip_html_tags(result['title']),
+            'description': GeminiService.strip_html_tags(result['description']),
+            'status': f"Live at {result['url']}"
+        })
+
+    # If generic but no clear results, inject WELL-KNOWN placeholders
+    if is_generic and not similar_projects and not is_concept_idea(idea_text):
+
+        similar_projects = [
+            {
+                "title": "Instagram",
+                "description": "A widely-used social platform for sharing photos and videos.",
+                "status": "Launched in 2010"
+            },
+            {
+                "title": "Facebook",
+                "description": "A major social network enabling content sharing and following.",
+                "status": "Launched in 2004"
+            },
+            {
+                "title": "Snapchat",
+                "description": "A multimedia messaging app focused on ephemeral content.",
+                "status": "Launched in 2011"
+            }
+        ]
+
+    return similar_projects
 
-    except ValueError as e:
+
+def pipeline_error_response(e: Exception):
+    """Map a pipeline failure to a (payload, status) response"""
+    if isinstance(e, RateLimitTimeout):
+        # Provider quota stayed exhausted; better to fail than report a false "unique"
+        print(f"Rate limit wait exceeded: {e}")
+        return {'error': 'Service is busy. Please try again in a moment.'}, 503
+    if isinstance(e, ValueError):
         # Handle missing API keys gracefully
         print(f"Configuration error: {e}")
-        return jsonify({'error': 'Service is temporarily unavailable. Please contact support.'}), 503
-    except Exception as e:
-        print(f"Error processing idea: {e}")
-        return jsonify({'error': 'An error occurred processing your idea'}), 500
+        return {'error': 'Service is temporarily unavailable. Please contact support.'}, 503
+
+    print(f"Error processing idea: {e}")
+    return {'error': 'An error occurred processing your idea'}, 500
 
 
 @app.route('/api/admin/ideas', methods=['GET'])
 @require_admin_auth
 def get_admin_ideas():
     """
-    Admin endpoint to retrieve all unique ideas stored in the database
+    Admin endpoint to retrieve stored unique ideas, newest first, from both
+    the hot table and the archive
+    Optional query params: since, until (ISO dates, until exclusive), limit, offset
     Requires HTTP Basic Authentication
     """
     try:
-        ideas = Idea.query.order_by(Idea.created_at.desc()).all()
+        since = request.args.get('since')
+        until = request.args.get('until')
+        since = datetime.fromisoformat(since) if since else None
+        until = datetime.fromisoformat(until) if until else None
+    except ValueError:
+        return jsonify({'error': 'since and until must be ISO dates'}), 400
+
+    # Always paged, so a request never loads the whole archive
+    limit = request.args.get('limit', app.config['IDEA_LIST_DEFAULT_LIMIT'], type=int)
+    limit = min(max(limit, 0), app.config['IDEA_LIST_MAX_LIMIT'])
+    offset = max(request.args.get('offset', 0, type=int), 0)
+
+    try:
+        ideas, total = get_idea_archive().list(db.session, since, until, limit, offset)
         return jsonify({
-            'ideas': [idea.to_dict() for idea in ideas],
-            'total': len(ideas)
+            'ideas': ideas,
+            'total': total
         }), 200
 
     except Exception as e:
@@ -407,6 +1055,82 @@ def get_admin_ideas():
         return jsonify({'error': 'An error occurred retrieving ideas'}), 500
 
 
+@app.route('/api/admin/ideas/<int:idea_id>', methods=['GET'])
+@require_admin_auth
+def get_admin_idea(idea_id):
+    """
+    Admin endpoint to look up a single idea by id, hot or archived
+    Requires HTTP Basic Authentication
+    """
+    try:
+        idea = get_idea_archive().get(db.session, idea_id)
+        if idea is None:
+            return jsonify({'error': 'Idea not found'}), 404
+        return jsonify(idea), 200
+
+    except Exception as e:
+        print(f"Error retrieving idea: {e}")
+        return jsonify({'error': 'An error occurred retrieving the idea'}), 500
+
+
+@app.route('/api/admin/stats', methods=['GET'])
+@require_admin_auth
+def get_admin_stats():
+    """
+    Admin endpoint serving pre-aggregated idea statistics
+    Reads only the aggregate tables, so cost does not grow with the ideas table
+    """
+    try:
+        days = min(max(request.args.get('days', 30, type=int), 1), 365)
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+
+        daily = IdeaDailyStat.query.filter(IdeaDailyStat.day >= since).order_by(IdeaDailyStat.day).all()
+        top_terms = IdeaTermStat.query.order_by(IdeaTermStat.count.desc()).limit(20).all()
+
+        totals = {
+            column: sum(getattr(d, column) for d in daily)
+            for column in ('submissions', 'generic_count', 'competitor_count', 'unique_count')
+        }
+        # Backfilled days have stored ideas but no submission counts, so the
+        # rate only covers days on which submissions were counted
+        counted = [d for d in daily if d.submissions > 0]
+        counted_unique = sum(d.unique_count for d in counted)
+        counted_submissions = sum(d.submissions for d in counted)
+        totals['unique_rate'] = (
+            round(counted_unique / counted_submissions, 3) if counted_submissions else None
+        )
+
+        return jsonify({
+            'days': days,
+            'daily': [d.to_dict() for d in daily],
+            'totals': totals,
+            'top_terms': [t.to_dict() for t in top_terms]
+        }), 200
+
+    except Exception as e:
+        print(f"Error retrieving stats: {e}")
+        return jsonify({'error': 'An error occurred retrieving stats'}), 500
+
+
+@app.route('/api/admin/metrics', methods=['GET'])
+@require_admin_auth
+def get_admin_metrics():
+    """
+    Admin endpoint exposing runtime metrics for this worker process
+    Requires admin authentication
+    """
+    return jsonify({
+        'rate_limits': get_rate_limiter().get_stats(),
+        'gemini_calls': gemini_call_stats.get_stats(),
+        'generic_classifier': generic_classifier.get_stats() if generic_classifier else None,
+        'idea_coalescing': get_idea_flight().stats,
+        'fake_project_pool': get_fake_project_pool().get_stats(),
+        'idea_write_behind': get_idea_writer().get_stats() if app.config['IDEA_WRITE_BEHIND'] else None,
+        'idea_archive': get_idea_archive().get_stats(db.session),
+        'admission': get_admission_controller().get_stats()
+    }), 200
+
+
 @app.route('/api/admin/users', methods=['GET'])
 @require_admin_auth
 def get_admin_users():
@@ -525,13 +1249,13 @@ def user_signup():
     if len(password) < 6:
         return jsonify({'error': 'Password must be at least 6 characters long'}), 400
 
-    # Check if username already exists
-    existing_user = User.query.filter_by(username=username).first()
+    # Check if username already exists (case-insensitively)
+    existing_user = find_user(username)
     if existing_user:
         return jsonify({'error': 'Username already exists. Please choose another.'}), 400
 
     # Also check if username exists in Admin table
-    existing_admin = Admin.query.filter_by(username=username).first()
+    existing_admin = Admin.query.filter(db.func.lower(Admin.username) == username.lower()).first()
     if existing_admin:
         return jsonify({'error': 'Username already exists. Please choose another.'}), 400
 
@@ -570,11 +1294,11 @@ def user_login():
     if not data or 'username' not in data or 'password' not in data:
         return jsonify({'error': 'Username and password required'}), 400
 
-    username = data['username']
+    username = data['username'].strip()
     password = data['password']
 
     # Check in User table
-    user = User.query.filter_by(username=username).first()
+    user = find_user(username)
 
     if not user or not user.check_password(password):
         return jsonify({'error': 'Invalid username or password. Please check your credentials or create an account.'}), 401
@@ -587,34 +1311,47 @@ def user_login():
     return jsonify({
         'success': True,
         'message': 'Login successful',
-        'username': username
+        'username': user.username
     }), 200
 
 
+def find_user(username: str):
+    """
+    Case-insensitive username lookup (served by the lower(username) index).
+    Accounts created before lookups were case-insensitive may differ only in
+    case; an exact match wins over those.
+    """
+    candidates = User.query.filter(db.func.lower(User.username) == username.lower()).all()
+    for user in candidates:
+        if user.username == username:
+            return user
+    return candidates[0] if candidates else None
+
+
 @app.route('/', methods=['GET'])
 def index():
     """Serve the main user-facing page"""
-    return render_template('user_login.html')
+    return response_optimizer.render_static_page('user_login.html')
 
 
 @app.route('/admin/login', methods=['GET'])
 def admin_login_page():
     """Serve the admin login page"""
-    return render_template('admin_login.html')
+    return response_optimizer.render_static_page('admin_login.html')
 
 
 @app.route('/admin', methods=['GET'])
 @require_admin_session
 def admin_dashboard():
     """Serve the admin dashboard HTML page (protected by session)"""
-    return render_template('admin_dashboard.html')
+    return response_optimizer.render_static_page('admin_dashboard.html')
 
 
 @app.route('/admin/users', methods=['GET'])
 @require_admin_session
 def admin_users_page():
     """Serve the admin users management HTML page (protected by session)"""
-    return render_template('admin_users.html')
+    return response_optimizer.render_static_page('admin_users.html')
 
 
 @app.route('/api/admin/logout', methods=['POST'])
@@ -627,24 +1364,59 @@ def admin_logout():
     }), 200
 
 
+PROCESS_STARTED = time.monotonic()
+
+
+def check_database():
+    """Round trip through the connection pool; reports pool usage"""
+    with app.app_context():
+        with db.engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        pool = db.engine.pool
+        if not hasattr(pool, 'checkedout'):
+            return {}
+        return {'pool_size': pool.size(), 'checked_out': pool.checkedout(), 'overflow': pool.overflow()}
+
+
+def check_brave():
+    # Unauthenticated request: proves the API answers without spending quota
+    return check_http(get_brave_search().base_url, app.config['HEALTH_CHECK_TIMEOUT'])
+
+
+def check_gemini():
+    get_gemini_service()  # fails if the API key is not configured
+    return check_http(GEMINI_API_ENDPOINT, app.config['HEALTH_CHECK_TIMEOUT'])
+
+
 @app.route('/health', methods=['GET'])
 def health():
-    """Health check endpoint"""
-    try:
-        # Check database connection
-        from sqlalchemy import text
-        with app.app_context():
-            with db.engine.connect() as conn:
-                conn.execute(text('SELECT 1'))
-        return jsonify({
-            'status': 'healthy',
-            'database': 'connected'
-        }), 200
-    except Exception as e:
+    """Health check endpoint (cached database check)"""
+    database = get_health_monitor().readiness()['dependencies']['database']
+    if database['status'] != 'ok':
         return jsonify({
             'status': 'unhealthy',
-            'error': str(e)
+            'error': database.get('error', f"database check is {database['status']}")
         }), 500
+    return jsonify({
+        'status': 'healthy',
+        'database': 'connected'
+    }), 200
+
+
+@app.route('/health/live', methods=['GET'])
+def health_live():
+    """Liveness probe: the process is up and serving requests. Checks no dependencies."""
+    return jsonify({
+        'status': 'alive',
+        'uptime_s': round(time.monotonic() - PROCESS_STARTED, 1)
+    }), 200
+
+
+@app.route('/health/ready', methods=['GET'])
+def health_ready():
+    """Readiness probe: cached results of the background dependency checks"""
+    readiness = get_health_monitor().readiness()
+    return jsonify(readiness), 200 if readiness['status'] == 'ready' else 503
 
 @app.route('/api/debug', methods=['GET'])
 def debug():
@@ -660,9 +1432,9 @@ def debug():
 
 
 def init_db():
-    """Initialize the database and create default admin"""
+    """Apply pending schema migrations and create default admin"""
     with app.app_context():
-        db.create_all()
+        apply_migrations(db.engine)
 
         # Create default admin if doesn't exist
         admin = Admin.query.filter_by(username='admin').first()
@@ -676,4 +1448,5 @@ def init_db():
 
 if __name__ == '__main__':
     init_db()
+    recover_buffered_ideas()
     app.run(debug=True)
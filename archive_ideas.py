@@ -0,0 +1,39 @@
+"""Move ideas past the retention window from the ideas table into compressed archive segments"""
+import sys
+
+print("=" * 50)
+print("Archiving old ideas...")
+print("=" * 50)
+
+try:
+    from app import app, db, get_idea_archive
+    from services.migrations import apply_migrations
+
+    with app.app_context():
+        apply_migrations(db.engine)
+        archive = get_idea_archive()
+
+        print(f"\n1. Archiving ideas older than {archive.retention_days} days"
+              + (f" or beyond the newest {archive.hot_max_rows}" if archive.hot_max_rows else "") + "...")
+        result = archive.archive(db.session)
+        print(f"   ✓ Moved {result['rows']} ideas into {result['segments']} new segments")
+
+        print("\n2. Current tiers...")
+        stats = archive.get_stats(db.session)
+        print(f"   ✓ Hot table: {stats['hot_rows']} ideas")
+        print(f"   ✓ Archive: {stats['archived_rows']} ideas in {stats['segments']} segments")
+
+        print("\n" + "=" * 50)
+        print("Archiving completed successfully!")
+        print("=" * 50)
+        sys.exit(0)
+
+except Exception as e:
+    print("\n" + "=" * 50)
+    print("ERROR during archiving:")
+    print("=" * 50)
+    print(f"\n{type(e).__name__}: {e}")
+    import traceback
+    traceback.print_exc()
+    print("\n" + "=" * 50)
+    sys.exit(1)
@@ -0,0 +1,104 @@
+"""
+ASGI entry point for the async serving mode
+
+    uvicorn asgi:application --workers 2
+
+POST /api/check-idea is served natively on the event loop with the async
+Brave/Gemini clients, so one process can hold hundreds of idea checks in
+flight (up to ADMISSION_MAX_CONCURRENT_ASYNC). Every other route is passed
+through to the Flask app.
+"""
+import json
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app, handle_check_idea_async, get_admission_controller, recover_buffered_ideas
+from services.admission import AdmissionRejected, client_address
+import app as app_module
+
+flask_application = WsgiToAsgi(app)
+
+# Flush ideas buffered by a worker that crashed before writing them
+recover_buffered_ideas()
+
+
+async def read_json_body(receive):
+    """Read the whole request body and parse it as JSON (None if it is not valid JSON)"""
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
+
+
+async def send_json(send, payload, status: int, extra_headers=()):
+    body = json.dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            # Match the Flask-CORS defaults used by the sync app
+            (b'access-control-allow-origin', b'*'),
+            *extra_headers
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def scope_client_id(scope) -> str:
+    headers = dict(scope.get('headers', []))
+    forwarded_for = headers.get(b'x-forwarded-for')
+    return client_address(
+        (scope.get('client') or (None,))[0],
+        forwarded_for.decode('latin-1') if forwarded_for else None,
+        app.config['ADMISSION_PROXY_HOPS']
+    )
+
+
+async def check_idea(scope, receive, send):
+    try:
+        ticket = await get_admission_controller().admit_async(scope_client_id(scope))
+    except AdmissionRejected as e:
+        await send_json(send, {'error': e.reason}, e.status,
+                        [(b'retry-after', str(e.retry_after).encode())])
+        return
+
+    with ticket:
+        data = await read_json_body(receive)
+
+        with app.app_context():
+            payload, status = await handle_check_idea_async(data)
+
+    await send_json(send, payload, status)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if app_module.async_brave_search is not None:
+                await app_module.async_brave_search.aclose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    if scope['type'] == 'http' and scope['path'] == '/api/check-idea' and scope['method'] == 'POST':
+        await check_idea(scope, receive, send)
+        return
+
+    await flask_application(scope, receive, send)
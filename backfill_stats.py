@@ -0,0 +1,67 @@
+"""Rebuild the analytics aggregate tables from the stored ideas (hot table and archive)"""
+import sys
+from collections import Counter
+
+print("=" * 50)
+print("Backfilling idea statistics...")
+print("=" * 50)
+
+try:
+    from app import app, db, Idea, IdeaDailyStat, IdeaTermStat, IdeaArchiveSegment
+    from services.analytics import idea_terms
+    from services.idea_archive import decode_segment
+    from services.migrations import apply_migrations
+
+    with app.app_context():
+        apply_migrations(db.engine)
+
+        print("\n1. Scanning ideas table and archive...")
+        per_day = Counter()
+        per_term = Counter()
+        scanned = 0
+        for idea in Idea.query.order_by(Idea.id).yield_per(1000):
+            per_day[idea.created_at.date()] += 1
+            per_term.update(idea_terms(idea.idea_text))
+            scanned += 1
+        for segment in IdeaArchiveSegment.query.order_by(IdeaArchiveSegment.id).yield_per(10):
+            for _, idea_text, created_at in decode_segment(segment.data):
+                per_day[created_at.date()] += 1
+                per_term.update(idea_terms(idea_text))
+                scanned += 1
+        print(f"   ✓ Scanned {scanned} ideas over {len(per_day)} days")
+
+        print("\n2. Rebuilding daily stats...")
+        # Submission and verdict counters cannot be derived from stored ideas, so they are kept
+        existing = {d.day: d for d in IdeaDailyStat.query.all()}
+        for day, stat in existing.items():
+            stat.unique_count = per_day.get(day, 0)
+        for day, count in per_day.items():
+            if day not in existing:
+                db.session.add(IdeaDailyStat(
+                    day=day, submissions=0, generic_count=0, competitor_count=0, unique_count=count
+                ))
+        print(f"   ✓ {len(set(existing) | set(per_day))} daily rows")
+
+        print("\n3. Rebuilding term frequencies...")
+        IdeaTermStat.query.delete()
+        db.session.bulk_insert_mappings(IdeaTermStat, [
+            {'term': term, 'count': count} for term, count in per_term.items()
+        ])
+        print(f"   ✓ {len(per_term)} terms")
+
+        db.session.commit()
+
+        print("\n" + "=" * 50)
+        print("Backfill completed successfully!")
+        print("=" * 50)
+        sys.exit(0)
+
+except Exception as e:
+    print("\n" + "=" * 50)
+    print("ERROR during backfill:")
+    print("=" * 50)
+    print(f"\n{type(e).__name__}: {e}")
+    import traceback
+    traceback.print_exc()
+    print("\n" + "=" * 50)
+    sys.exit(1)
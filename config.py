@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,4 +23,106 @@ class Config:
     BRAVE_API_KEY = os.getenv('BRAVE_API_KEY')
 
     # Admin
-    ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
\ No newline at end of file
+    ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
+
+    # Provider rate limits (shared by all workers on a host)
+    RATE_LIMIT_DB_PATH = os.getenv(
+        'RATE_LIMIT_DB_PATH',
+        os.path.join(tempfile.gettempdir(), 'idea_checker_rate_limits.sqlite3')
+    )
+    RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '15'))
+    BRAVE_RATE_PER_SECOND = float(os.getenv('BRAVE_RATE_PER_SECOND', '1'))
+    BRAVE_RATE_BURST = float(os.getenv('BRAVE_RATE_BURST', '1'))
+    GEMINI_RATE_PER_SECOND = float(os.getenv('GEMINI_RATE_PER_SECOND', '0.25'))
+    GEMINI_RATE_BURST = float(os.getenv('GEMINI_RATE_BURST', '4'))
+
+    # Coalescing of identical in-flight idea submissions
+    IDEA_FLIGHT_DIR = os.getenv(
+        'IDEA_FLIGHT_DIR',
+        os.path.join(tempfile.gettempdir(), 'idea_checker_flights')
+    )
+    # How long a finished result is reused for identical submissions from other workers
+    IDEA_FLIGHT_RESULT_TTL = float(os.getenv('IDEA_FLIGHT_RESULT_TTL', '30'))
+
+    # Stop searching once this many relevant, product-like competitors are found
+    COMPETITOR_TARGET = int(os.getenv('COMPETITOR_TARGET', '5'))
+
+    # Pre-generated fake-project templates served for unique ideas
+    FAKE_PROJECT_POOL_SIZE = int(os.getenv('FAKE_PROJECT_POOL_SIZE', '30'))
+    FAKE_PROJECT_POOL_LOW_WATERMARK = int(os.getenv('FAKE_PROJECT_POOL_LOW_WATERMARK', '10'))
+    # Gemini calls per minute that pool refills may make, across all workers on the host
+    FAKE_PROJECT_REFILLS_PER_MINUTE = float(os.getenv('FAKE_PROJECT_REFILLS_PER_MINUTE', '2'))
+    # Also run the live Gemini generation in the background to enrich the pool
+    FAKE_PROJECT_REFINE = os.getenv('FAKE_PROJECT_REFINE', 'false').lower() == 'true'
+
+    # Connection pool size for the async Brave client (ASGI mode)
+    ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', '100'))
+
+    # Write-behind batching of Idea inserts
+    IDEA_WRITE_BEHIND = os.getenv('IDEA_WRITE_BEHIND', 'true').lower() == 'true'
+    IDEA_SPOOL_DIR = os.getenv('IDEA_SPOOL_DIR', os.path.join(os.getcwd(), 'spool'))
+    IDEA_FLUSH_BATCH_SIZE = int(os.getenv('IDEA_FLUSH_BATCH_SIZE', '50'))
+    IDEA_FLUSH_INTERVAL = float(os.getenv('IDEA_FLUSH_INTERVAL', '2'))
+
+    # Minimum TF-IDF cosine similarity between an idea and a search result
+    RELEVANCE_THRESHOLD = float(os.getenv('RELEVANCE_THRESHOLD', '0.1'))
+
+    # How often in-memory submission counters are folded into the daily stats table
+    STATS_COMPACTION_INTERVAL = float(os.getenv('STATS_COMPACTION_INTERVAL', '10'))
+
+    # Responses at least this large (bytes) are gzip/brotli compressed
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+
+    # Ideas older than this many days are moved from the ideas table into compressed archive segments
+    IDEA_RETENTION_DAYS = int(os.getenv('IDEA_RETENTION_DAYS', '90'))
+    # Optional cap on hot-table rows (0 = age-based retention only)
+    IDEA_HOT_MAX_ROWS = int(os.getenv('IDEA_HOT_MAX_ROWS', '0'))
+    IDEA_ARCHIVE_SEGMENT_ROWS = int(os.getenv('IDEA_ARCHIVE_SEGMENT_ROWS', '5000'))
+    # How often each worker runs an archive pass (0 = only via archive_ideas.py)
+    IDEA_ARCHIVE_INTERVAL = float(os.getenv('IDEA_ARCHIVE_INTERVAL', '3600'))
+    # Page size of /api/admin/ideas when no limit is given, and the largest page allowed
+    IDEA_LIST_DEFAULT_LIMIT = int(os.getenv('IDEA_LIST_DEFAULT_LIMIT', '100'))
+    IDEA_LIST_MAX_LIMIT = int(os.getenv('IDEA_LIST_MAX_LIMIT', '1000'))
+
+    # Gemini model per tier: the light model handles the short classification calls
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+    GEMINI_LIGHT_MODEL = os.getenv('GEMINI_LIGHT_MODEL', 'gemini-1.5-flash-8b')
+    # Token budget for the search results included in the uniqueness prompt
+    GEMINI_CONTEXT_TOKENS = int(os.getenv('GEMINI_CONTEXT_TOKENS', '400'))
+
+    # Local generic-idea classifier: versioned artifacts, and the Gemini verdicts it is trained on
+    GENERIC_CLASSIFIER_DIR = os.getenv('GENERIC_CLASSIFIER_DIR', os.path.join(os.getcwd(), 'artifacts'))
+    # Below this confidence the idea is sent to Gemini instead
+    GENERIC_CLASSIFIER_CONFIDENCE = float(os.getenv('GENERIC_CLASSIFIER_CONFIDENCE', '0.85'))
+    GENERIC_VERDICT_LOG = os.getenv(
+        'GENERIC_VERDICT_LOG',
+        os.path.join(os.getcwd(), 'data', 'generic_verdicts.jsonl')
+    )
+
+    # Batch idea checks (POST /api/check-ideas)
+    BATCH_MAX_IDEAS = int(os.getenv('BATCH_MAX_IDEAS', '50'))
+    # Ideas of one batch whose searches/analysis run at the same time
+    BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+    # Ideas per batched Gemini prompt
+    GEMINI_BATCH_SIZE = int(os.getenv('GEMINI_BATCH_SIZE', '10'))
+
+    # Admission control for the idea-check pipeline
+    # Per-client submissions per second / burst, shared by all workers on the host
+    ADMISSION_CLIENT_RATE = float(os.getenv('ADMISSION_CLIENT_RATE', '0.2'))
+    ADMISSION_CLIENT_BURST = float(os.getenv('ADMISSION_CLIENT_BURST', '5'))
+    # Pipelines running at once per worker process, and how many more may wait for a slot
+    ADMISSION_MAX_CONCURRENT = int(os.getenv('ADMISSION_MAX_CONCURRENT', '4'))
+    ADMISSION_MAX_CONCURRENT_ASYNC = int(os.getenv('ADMISSION_MAX_CONCURRENT_ASYNC', '200'))
+    ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', '8'))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', '5'))
+    # Reverse proxies in front of the app that append to X-Forwarded-For (1 on Render)
+    ADMISSION_PROXY_HOPS = int(os.getenv('ADMISSION_PROXY_HOPS', '1'))
+
+    # Background dependency checks behind /health/ready (seconds between rounds, per-request timeout)
+    HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', '15'))
+    HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', '3'))
+    # Dependencies that must be up for the worker to report ready; the others are informational.
+    # Requiring brave/gemini takes every instance out of rotation during an upstream outage.
+    HEALTH_READY_REQUIRES = [
+        name.strip() for name in os.getenv('HEALTH_READY_REQUIRES', 'database').split(',') if name.strip()
+    ]
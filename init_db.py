@@ -8,15 +8,16 @@ print("=" * 50)
 
 try:
     from app import app, db, Admin
+    from services.migrations import apply_migrations, schema_version
 
     with app.app_context():
-        print("\n1. Dropping existing tables (if any)...")
-        db.drop_all()
-        print("   ✓ Old tables dropped")
-
-        print("\n2. Creating fresh database tables...")
-        db.create_all()
-        print("   ✓ Tables created: users, admins, ideas")
+        print("\n1. Applying schema migrations...")
+        applied = apply_migrations(db.engine)
+        for name in applied:
+            print(f"   ✓ Applied migration {name}")
+        if not applied:
+            print("   ✓ Schema already up to date")
+        print(f"   ✓ Schema version: {schema_version(db.engine)}")
 
         # Verify tables were created
         from sqlalchemy import inspect
@@ -24,7 +25,7 @@ try:
         tables = inspector.get_table_names()
         print(f"   ✓ Verified tables in database: {tables}")
 
-        print("\n3. Creating default admin user...")
+        print("\n2. Creating default admin user...")
         admin = Admin.query.filter_by(username='admin').first()
         if not admin:
             admin_password = os.environ.get('ADMIN_PASSWORD', 'admin123')
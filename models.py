@@ -10,7 +10,7 @@ class Idea(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     idea_text = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
 
     def to_dict(self):
         """Convert idea to dictionary"""
@@ -55,7 +55,12 @@ class User(db.Model):
     username = db.Column(db.String(80), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     user_type = db.Column(db.String(20), nullable=False, default='user')
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        # Case-insensitive username lookups (login/signup)
+        db.Index('ix_users_username_lower', db.func.lower(username)),
+    )
 
     def set_password(self, password):
         """Hash and set password"""
@@ -73,4 +78,68 @@ class User(db.Model):
             'password_hash': self.password_hash,
             'user_type': self.user_type,
             'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+        }
+
+class IdeaDailyStat(db.Model):
+    """Per-day submission and verdict counters, maintained incrementally"""
+    __tablename__ = 'idea_daily_stats'
+
+    day = db.Column(db.Date, primary_key=True)
+    submissions = db.Column(db.Integer, nullable=False, default=0)
+    generic_count = db.Column(db.Integer, nullable=False, default=0)
+    competitor_count = db.Column(db.Integer, nullable=False, default=0)
+    unique_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        """Convert daily stats to dictionary"""
+        return {
+            'day': self.day.isoformat(),
+            'submissions': self.submissions,
+            'generic_count': self.generic_count,
+            'competitor_count': self.competitor_count,
+            'unique_count': self.unique_count
+        }
+
+
+class IdeaTermStat(db.Model):
+    """How many stored (unique) ideas mention each term, maintained incrementally"""
+    __tablename__ = 'idea_term_stats'
+
+    term = db.Column(db.String(64), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0, index=True)
+
+    def to_dict(self):
+        """Convert term stats to dictionary"""
+        return {
+            'term': self.term,
+            'count': self.count
+        }
+
+
+class IdeaArchiveSegment(db.Model):
+    """
+    An immutable, gzip-compressed JSONL block of archived ideas.
+    The id and date bounds double as the archive's lookup index.
+    """
+    __tablename__ = 'idea_archive_segments'
+
+    id = db.Column(db.Integer, primary_key=True)
+    first_id = db.Column(db.Integer, nullable=False, index=True)
+    last_id = db.Column(db.Integer, nullable=False, index=True)
+    first_created_at = db.Column(db.DateTime, nullable=False, index=True)
+    last_created_at = db.Column(db.DateTime, nullable=False, index=True)
+    row_count = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        """Convert segment metadata (without the payload) to dictionary"""
+        return {
+            'id': self.id,
+            'first_id': self.first_id,
+            'last_id': self.last_id,
+            'first_created_at': self.first_created_at.isoformat(),
+            'last_created_at': self.last_created_at.isoformat(),
+            'row_count': self.row_count,
+            'archived_at': self.archived_at.isoformat()
+        }
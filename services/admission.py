@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+from services.rate_limiter import SharedRateLimiter
+
+
+def client_address(remote_addr: Optional[str], forwarded_for: Optional[str], proxy_hops: int) -> str:
+    """
+    The client's IP for per-client limits. Behind `proxy_hops` trusted proxies,
+    this is the entry that the outermost trusted proxy added to X-Forwarded-For.
+    Entries further left can be forged by the client.
+    """
+    if proxy_hops and forwarded_for:
+        hops = [h.strip() for h in forwarded_for.split(',') if h.strip()]
+        if hops:
+            return hops[-min(proxy_hops, len(hops))]
+    return remote_addr or 'unknown'
+
+
+class AdmissionRejected(Exception):
+    """A request was turned away; status is 429 (client over its rate) or 503 (server busy)"""
+
+    def __init__(self, status: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status = status
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class _ThreadLane:
+    """At most max_running slots held at once, with a bounded FIFO-ish wait queue (threads)"""
+
+    def __init__(self, max_running: int, max_waiting: int):
+        self.max_running = max_running
+        self.max_waiting = max_waiting
+        self.running = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float, slots: int = 1) -> bool:
+        with self._cond:
+            if self.running + slots <= self.max_running and self.waiting == 0:
+                self.running += slots
+                return True
+            if self.waiting >= self.max_waiting:
+                return False
+            self.waiting += 1
+            try:
+                admitted = self._cond.wait_for(lambda: self.running + slots <= self.max_running, timeout)
+            finally:
+                self.waiting -= 1
+            if admitted:
+                self.running += slots
+            return admitted
+
+    def release(self, slots: int = 1):
+        with self._cond:
+            self.running -= slots
+            self._cond.notify_all()
+
+
+class _AsyncLane:
+    """asyncio counterpart of _ThreadLane, for the ASGI event loop"""
+
+    def __init__(self, max_running: int, max_waiting: int):
+        self.max_running = max_running
+        self.max_waiting = max_waiting
+        self.running = 0
+        self.waiting = 0
+        self._cond = None  # created on first use, inside the running loop
+
+    async def acquire(self, timeout: float, slots: int = 1) -> bool:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            if self.running + slots <= self.max_running and self.waiting == 0:
+                self.running += slots
+                return True
+            if self.waiting >= self.max_waiting:
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self._cond.wait_for(lambda: self.running + slots <= self.max_running), timeout
+                )
+                admitted = True
+            except asyncio.TimeoutError:
+                admitted = False
+            finally:
+                self.waiting -= 1
+            if admitted:
+                self.running += slots
+            return admitted
+
+    def release(self, slots: int = 1):
+        self.running -= slots
+        if self._cond is not None:
+            asyncio.ensure_future(self._notify())
+
+    async def _notify(self):
+        async with self._cond:
+            self._cond.notify_all()
+
+
+class AdmissionTicket:
+    """Held pipeline slots; release() is idempotent, and the ticket works as a context manager"""
+
+    def __init__(self, controller: 'AdmissionController', lane, slots: int = 1):
+        self.controller = controller
+        self.lane = lane
+        self.slots = slots
+        self.start = time.monotonic()
+        self._released = False
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self.lane.release(self.slots)
+        self.controller._finished(time.monotonic() - self.start)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class AdmissionController:
+    """
+    Admission control for the expensive idea-check pipeline.
+
+    A request must pass two gates before it runs:
+    1. A per-client token bucket (`rate` per second, `burst` deep), kept in the
+       shared SQLite rate limiter so every worker on the host sees the same
+       budget. An empty bucket means 429 right away, with Retry-After set to
+       when the tokens will be there.
+    2. A per-process cap of `max_concurrent` running pipelines. Up to
+       `max_queue` more requests wait for a slot, for at most `queue_timeout`
+       seconds. A full queue or a timed-out wait means 503.
+
+    Only routes that opt in are gated. Health checks, logins and admin pages
+    never queue behind idea checks.
+    """
+
+    def __init__(self, limiter: SharedRateLimiter, rate: float, burst: float,
+                 max_concurrent: int, max_queue: int, queue_timeout: float,
+                 max_concurrent_async: Optional[int] = None):
+        self.limiter = limiter
+        self.rate = rate
+        self.burst = burst
+        self.queue_timeout = queue_timeout
+        self.lane = _ThreadLane(max_concurrent, max_queue)
+        self.async_lane = _AsyncLane(max_concurrent_async or max_concurrent, max_queue)
+        self._avg_duration = 2.0  # seconds, exponentially weighted
+        self._stats_lock = threading.Lock()
+        self.stats = {'admitted': 0, 'queued': 0, 'rejected_rate': 0, 'rejected_busy': 0}
+
+    def admit(self, client_id: str, cost: float = 1, slots: int = 1) -> AdmissionTicket:
+        """
+        Pass both gates (blocking while queued) or raise AdmissionRejected.
+        A request that runs several pipelines at once takes one slot for each.
+        """
+        slots = self.max_slots(slots)
+        self._check_client(client_id, cost)
+        queued = not self._has_free_slot(self.lane, slots)
+        if not self.lane.acquire(self.queue_timeout, slots):
+            # Being turned away as busy is not the client's doing
+            self._refund_client(client_id, cost)
+            self._reject_busy(self.lane)
+        self._count('admitted', queued)
+        return AdmissionTicket(self, self.lane, slots)
+
+    async def admit_async(self, client_id: str, cost: float = 1) -> AdmissionTicket:
+        """Async counterpart of admit() for the ASGI serving mode"""
+        # The client bucket lives in SQLite and may wait on its write lock; keep that off the loop
+        await asyncio.to_thread(self._check_client, client_id, cost)
+        queued = not self._has_free_slot(self.async_lane)
+        if not await self.async_lane.acquire(self.queue_timeout):
+            await asyncio.to_thread(self._refund_client, client_id, cost)
+            self._reject_busy(self.async_lane)
+        self._count('admitted', queued)
+        return AdmissionTicket(self, self.async_lane)
+
+    def max_slots(self, slots: int) -> int:
+        """Slots a sync request can actually hold (never more than the whole cap)"""
+        return max(1, min(slots, self.lane.max_running))
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                **self.stats,
+                'running': self.lane.running + self.async_lane.running,
+                'waiting': self.lane.waiting + self.async_lane.waiting,
+                'avg_run_ms': round(self._avg_duration * 1000, 2)
+            }
+
+    @staticmethod
+    def _client_bucket(client_id: str) -> str:
+        return 'client:' + hashlib.sha256(client_id.encode()).hexdigest()[:16]
+
+    def _check_client(self, client_id: str, cost: float):
+        wait = self.limiter.take(self._client_bucket(client_id), self.rate, self.burst, cost)
+        if wait > 0:
+            self._count('rejected_rate')
+            raise AdmissionRejected(429, math.ceil(wait), 'Too many ideas submitted. Please slow down.')
+
+    def _refund_client(self, client_id: str, cost: float):
+        self.limiter.refund(self._client_bucket(client_id), self.burst, cost)
+
+    @staticmethod
+    def _has_free_slot(lane, slots: int = 1) -> bool:
+        return lane.running + slots <= lane.max_running and lane.waiting == 0
+
+    def _reject_busy(self, lane):
+        self._count('rejected_busy')
+        # Roughly how long until the current queue drains
+        drain = self._avg_duration * (lane.waiting + 1) / max(lane.max_running, 1)
+        raise AdmissionRejected(503, max(1, math.ceil(drain)), 'Service is busy. Please try again shortly.')
+
+    def _finished(self, duration: float):
+        with self._stats_lock:
+            self._avg_duration = 0.9 * self._avg_duration + 0.1 * duration
+
+    def _count(self, key: str, queued: bool = False):
+        with self._stats_lock:
+            self.stats[key] += 1
+            if queued:
+                self.stats['queued'] += 1
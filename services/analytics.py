@@ -0,0 +1,111 @@
+import atexit
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from models import IdeaDailyStat, IdeaTermStat
+from services.relevance import TOKEN_BYTES, normalize_token
+
+# Verdict name -> IdeaDailyStat counter column
+VERDICT_COLUMNS = {
+    'generic': 'generic_count',
+    'competitors': 'competitor_count',
+}
+
+
+def idea_terms(idea_text: str) -> set:
+    """Distinct normalized terms of an idea, for the term frequency table"""
+    terms = set()
+    for token in idea_text.lower().encode('ascii', 'ignore').translate(TOKEN_BYTES).split():
+        term = normalize_token(token.decode())
+        if term and len(term) >= 4:
+            terms.add(term[:64])
+    return terms
+
+
+def upsert_increments(session, model, key: str, rows: List[Dict]):
+    """
+    Add each row's counters onto the existing aggregate row (or create it),
+    as one multi-row INSERT ... ON CONFLICT DO UPDATE in the caller's transaction.
+    """
+    if not rows:
+        return
+
+    if session.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(model).values(rows)
+    counters = [column for column in rows[0] if column != key]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={column: getattr(model, column) + getattr(stmt.excluded, column) for column in counters}
+    )
+    session.execute(stmt)
+
+
+def record_stored_ideas(session, rows: List[Dict]):
+    """Fold newly inserted ideas into the daily and term aggregates (same transaction as the insert)"""
+    per_day = Counter(row['created_at'].date() for row in rows)
+    per_term = Counter(term for row in rows for term in idea_terms(row['idea_text']))
+
+    upsert_increments(session, IdeaDailyStat, 'day', [
+        {'day': day, 'unique_count': count} for day, count in sorted(per_day.items())
+    ])
+    upsert_increments(session, IdeaTermStat, 'term', [
+        {'term': term, 'count': count} for term, count in sorted(per_term.items())
+    ])
+
+
+class SubmissionStats:
+    """
+    In-memory submission and verdict counters, compacted into the
+    daily aggregate table every `interval` seconds and at exit.
+    """
+
+    def __init__(self, apply_rows: Callable[[List[Dict]], None], interval: float = 10):
+        self.apply_rows = apply_rows
+        self.interval = interval
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name='submission-stats', daemon=True).start()
+        atexit.register(self.stop)
+
+    def record(self, verdict: str):
+        """Count one checked idea and its verdict ('generic', 'competitors' or 'unique')"""
+        day = datetime.utcnow().date()
+        with self._lock:
+            self._counts[(day, 'submissions')] += 1
+            if verdict in VERDICT_COLUMNS:
+                self._counts[(day, VERDICT_COLUMNS[verdict])] += 1
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return
+
+        rows = {}
+        for (day, column), value in counts.items():
+            rows.setdefault(day, {'day': day, 'submissions': 0, 'generic_count': 0, 'competitor_count': 0})
+            rows[day][column] += value
+
+        try:
+            self.apply_rows([rows[day] for day in sorted(rows)])
+        except Exception as e:
+            print(f"Error compacting submission stats: {e}")
+            with self._lock:
+                self._counts.update(counts)
+
+    def stop(self):
+        self._stop.set()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
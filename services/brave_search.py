@@ -1,12 +1,47 @@
+import httpx
 import requests
-from typing import List, Dict
+from typing import List, Dict, Optional
+from services.rate_limiter import TokenBucket, UpstreamRateLimited
 
 class BraveSearchService:
     """Service for interacting with Brave Search API"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, rate_limit: Optional[TokenBucket] = None):
         self.api_key = api_key
         self.base_url = "https://api.search.brave.com/res/v1/web/search"
+        self.rate_limit = rate_limit
+
+    def _headers(self) -> Dict:
+        return {
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip",
+            "X-Subscription-Token": self.api_key
+        }
+
+    @staticmethod
+    def _params(query: str, count: int) -> Dict:
+        return {
+            "q": query,
+            "count": min(count, 20)  # Brave API max is 20
+        }
+
+    @staticmethod
+    def _check_rate_limited(status_code: int):
+        if status_code == 429:
+            raise UpstreamRateLimited("brave answered 429 Too Many Requests")
+
+    @staticmethod
+    def _parse_results(data: Dict) -> List[Dict]:
+        results = []
+        if "web" in data and "results" in data["web"]:
+            for result in data["web"]["results"]:
+                results.append({
+                    "title": result.get("title", ""),
+                    "description": result.get("description", ""),
+                    "url": result.get("url", "")
+                })
+
+        return results
 
     def search(self, query: str, count: int = 10) -> List[Dict]:
         """
@@ -18,34 +53,58 @@ class BraveSearchService:
 
         Returns:
             List of search results with title, description, and url
-        """
-        headers = {
-            "Accept": "application/json",
-            "Accept-Encoding": "gzip",
-            "X-Subscription-Token": self.api_key
-        }
 
-        params = {
-            "q": query,
-            "count": min(count, 20)  # Brave API max is 20
-        }
+        Raises:
+            RateLimitTimeout: if the shared Brave quota stays exhausted for too long,
+                or Brave answers 429 (an empty result would look like a unique idea)
+        """
+        # Queue for the shared quota instead of bursting into a 429
+        if self.rate_limit:
+            self.rate_limit.acquire()
 
         try:
-            response = requests.get(self.base_url, headers=headers, params=params)
+            response = requests.get(self.base_url, headers=self._headers(), params=self._params(query, count))
+            self._check_rate_limited(response.status_code)
             response.raise_for_status()
-            data = response.json()
+            return self._parse_results(response.json())
+
+        except requests.exceptions.RequestException as e:
+            print(f"Error searching with Brave API: {e}")
+            return []
 
-            results = []
-            if "web" in data and "results" in data["web"]:
-                for result in data["web"]["results"]:
-                    results.append({
-                        "title": result.get("title", ""),
-                        "description": result.get("description", ""),
-                        "url": result.get("url", "")
-                    })
 
-            return results
+class AsyncBraveSearchService(BraveSearchService):
+    """
+    Async variant of BraveSearchService for the ASGI serving mode.
+    All searches share one pooled HTTP client with keep-alive connections.
+    """
 
-        except requests.exceptions.RequestException as e:
+    def __init__(self, api_key: str, rate_limit: Optional[TokenBucket] = None,
+                 max_connections: int = 100):
+        super().__init__(api_key, rate_limit=rate_limit)
+        self.client = httpx.AsyncClient(
+            timeout=10,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections // 5
+            )
+        )
+
+    async def search(self, query: str, count: int = 10) -> List[Dict]:
+        """Async counterpart of BraveSearchService.search"""
+        if self.rate_limit:
+            await self.rate_limit.acquire_async()
+
+        try:
+            response = await self.client.get(self.base_url, headers=self._headers(), params=self._params(query, count))
+            self._check_rate_limited(response.status_code)
+            response.raise_for_status()
+            return self._parse_results(response.json())
+
+        except httpx.HTTPError as e:
             print(f"Error searching with Brave API: {e}")
             return []
+
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self.client.aclose()
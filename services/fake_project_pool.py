@@ -0,0 +1,261 @@
+import random
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Coarse idea categories, matched by keyword
+CATEGORY_KEYWORDS = {
+    'food': ['food', 'cook', 'recipe', 'meal', 'restaurant', 'kitchen', 'drink', 'coffee', 'snack', 'grocery'],
+    'health': ['health', 'fitness', 'workout', 'doctor', 'medical', 'sleep', 'diet', 'therapy', 'mental', 'gym'],
+    'social': ['social', 'friend', 'dating', 'chat', 'community', 'share', 'sharing', 'message', 'network'],
+    'finance': ['money', 'bank', 'finance', 'payment', 'budget', 'invest', 'crypto', 'loan', 'savings'],
+    'education': ['learn', 'learning', 'school', 'student', 'teacher', 'course', 'study', 'tutor', 'class'],
+    'travel': ['travel', 'trip', 'hotel', 'flight', 'vacation', 'tourist', 'booking'],
+    'pets': ['pet', 'dog', 'cat', 'puppy', 'animal', 'vet'],
+    'home': ['home', 'house', 'furniture', 'clean', 'cleaning', 'garden', 'apartment', 'chore'],
+    'transport': ['car', 'bike', 'ride', 'drive', 'parking', 'transit', 'scooter', 'delivery', 'drone'],
+    'entertainment': ['game', 'gaming', 'music', 'movie', 'video', 'stream', 'streaming', 'art', 'painting'],
+}
+
+GENERAL_CATEGORY = 'general'
+
+STOPWORDS = {
+    'the', 'and', 'for', 'that', 'with', 'app', 'application', 'this', 'which', 'who', 'where',
+    'when', 'your', 'you', 'their', 'they', 'them', 'from', 'into', 'can', 'will', 'lets',
+    'let', 'allows', 'help', 'helps', 'using', 'use', 'uses', 'based', 'platform', 'service',
+    'website', 'device', 'tool', 'system', 'people', 'users', 'user', 'new', 'way', 'like',
+    'are', 'has', 'have', 'its', 'not', 'but', 'all', 'any', 'more', 'most', 'very', 'also'
+}
+
+# Built-in templates so the pool is never empty, even before the first refill
+SEED_TEMPLATES = [
+    {
+        "title": "{Term}Hub",
+        "description": "A venture-backed startup offering {phrase} to early adopters through an invite-only beta.",
+        "status": "Private beta since {year}"
+    },
+    {
+        "title": "{Term2}{Term} Labs",
+        "description": "An R&D studio that has already prototyped {phrase} and is preparing a wider rollout.",
+        "status": "Patent pending ({year})"
+    },
+    {
+        "title": "Open{Term}",
+        "description": "An open-source project delivering {phrase}, maintained by a small team of contributors.",
+        "status": "Active development since {year}"
+    },
+    {
+        "title": "{Term}ly",
+        "description": "A consumer product built around {phrase}, currently live in several regional markets.",
+        "status": "Launched in {year}"
+    },
+    {
+        "title": "Project {Term}",
+        "description": "An internal initiative at a large tech company exploring {phrase} at scale.",
+        "status": "Stealth mode (details confidential)"
+    },
+    {
+        "title": "{Phrase} Co.",
+        "description": "A bootstrapped company selling {phrase} directly to customers online.",
+        "status": "Acquired in {year}"
+    },
+]
+
+
+def categorize(idea: str) -> str:
+    """Bucket an idea into a coarse category by keyword"""
+    words = set(re.findall(r'[a-z]+', idea.lower()))
+    best, best_hits = GENERAL_CATEGORY, 0
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        hits = sum(1 for k in keywords if k in words or f"{k}s" in words)
+        if hits > best_hits:
+            best, best_hits = category, hits
+    return best
+
+
+def extract_key_terms(idea: str, limit: int = 3) -> List[str]:
+    """Pick the first few meaningful words of an idea, in order"""
+    terms = []
+    for word in re.findall(r'[a-zA-Z]{3,}', idea.lower()):
+        if word not in STOPWORDS and word not in terms:
+            terms.append(word)
+        if len(terms) == limit:
+            break
+    return terms or ['idea']
+
+
+def build_slots(idea: str) -> Dict[str, str]:
+    """Values for every template slot, derived locally from the idea"""
+    terms = extract_key_terms(idea)
+    term = terms[0]
+    term2 = terms[1] if len(terms) > 1 else 'smart'
+    phrase = ' '.join(terms)
+    return {
+        'term': term,
+        'Term': term.capitalize(),
+        'term2': term2,
+        'Term2': term2.capitalize(),
+        'phrase': phrase,
+        'Phrase': phrase.title(),
+        'year': str(random.randint(datetime.utcnow().year - 6, datetime.utcnow().year - 1)),
+    }
+
+
+def fill_template(template: Dict, slots: Dict[str, str]) -> Optional[Dict]:
+    """
+    Fill a template's term/Term/term2/Term2/phrase/Phrase/year slots.
+    Returns None if the template is malformed or uses an unknown slot.
+    """
+    try:
+        return {
+            field: str(template.get(field, '')).format_map(slots)
+            for field in ('title', 'description', 'status')
+        }
+    except (KeyError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def templatize(idea: str, project: Dict) -> Dict:
+    """Turn a project written for one idea into a reusable template"""
+    template = {}
+    terms = extract_key_terms(idea)
+    for field in ('title', 'description', 'status'):
+        text = str(project.get(field, '')).replace('{', '').replace('}', '')
+        phrase = ' '.join(terms)
+        text = re.sub(re.escape(phrase), '{phrase}', text, flags=re.IGNORECASE)
+        for slot, term in zip(('term', 'term2'), terms):
+            text = re.sub(rf'\b{re.escape(term)}\b', f'{{{slot}}}', text)
+            text = re.sub(rf'\b{re.escape(term.capitalize())}\b', f'{{{slot.capitalize()}}}', text)
+        template[field] = text
+    return template
+
+
+class FakeProjectPool:
+    """
+    Pool of pre-generated fake-project templates, bucketed by idea category.
+
+    The response path takes templates from the pool and fills their slots
+    locally, so no LLM call is needed. When a bucket drops below the low
+    watermark, a background thread adds one batch of generated templates.
+
+    Refills share the LLM quota with live requests, so each one makes a
+    single call, and only when `refill_budget()` allows it. Otherwise the
+    refill is skipped and tried again on a later take; the seeds keep
+    serving in the meantime.
+    """
+
+    def __init__(self, generate_templates: Optional[Callable[[str, int], List[Dict]]] = None,
+                 max_size: int = 30, low_watermark: int = 10, refill_batch: int = 5,
+                 refill_budget: Optional[Callable[[], bool]] = None):
+        self.generate_templates = generate_templates
+        self.max_size = max_size
+        self.low_watermark = low_watermark
+        self.refill_batch = refill_batch
+        self.refill_budget = refill_budget
+
+        self._pools: Dict[str, deque] = {}
+        self._pending_refills = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='fake-project-pool')
+        self.stats = {'hits': 0, 'misses': 0, 'refills': 0, 'refills_skipped': 0, 'refill_failures': 0,
+                      'refinements': 0}
+
+    def _pool(self, category: str) -> deque:
+        pool = self._pools.get(category)
+        if pool is None:
+            pool = deque(random.sample(SEED_TEMPLATES, len(SEED_TEMPLATES)), maxlen=self.max_size)
+            self._pools[category] = pool
+        return pool
+
+    def take(self, idea: str, count: int = 3) -> List[Dict]:
+        """
+        Get `count` fake projects for an idea without calling an LLM.
+
+        Falls back to the built-in seed templates if the category's bucket
+        is empty.
+        """
+        category = categorize(idea)
+
+        with self._lock:
+            pool = self._pool(category)
+            templates = [pool.popleft() for _ in range(min(count, len(pool)))]
+            hit = len(templates) == count
+            self.stats['hits' if hit else 'misses'] += 1
+            needs_refill = len(pool) < self.low_watermark and category not in self._pending_refills
+            if needs_refill:
+                self._pending_refills.add(category)
+
+        if needs_refill:
+            self._executor.submit(self._refill, category)
+
+        if not hit:
+            seeds = [t for t in random.sample(SEED_TEMPLATES, len(SEED_TEMPLATES)) if t not in templates]
+            templates += seeds[:count - len(templates)]
+
+        # Fresh slots per project so each one gets its own year
+        projects = [fill_template(t, build_slots(idea)) for t in templates]
+        return [p for p in projects if p]
+
+    def _refill(self, category: str):
+        """Add one batch of templates to a bucket (runs on the background thread)"""
+        try:
+            with self._lock:
+                missing = self.max_size - len(self._pool(category))
+            if missing <= 0:
+                return
+            if self.refill_budget is not None and not self.refill_budget():
+                self.stats['refills_skipped'] += 1
+                return
+
+            batch = self._generate(category, min(missing, self.refill_batch))
+            if batch:
+                self._add(category, batch)
+            self.stats['refills'] += 1
+        except Exception as e:
+            self.stats['refill_failures'] += 1
+            print(f"Error refilling fake project pool ({category}): {e}")
+        finally:
+            with self._lock:
+                self._pending_refills.discard(category)
+
+    def _generate(self, category: str, count: int) -> List[Dict]:
+        if self.generate_templates is None:
+            return random.sample(SEED_TEMPLATES, min(count, len(SEED_TEMPLATES)))
+
+        sample_slots = build_slots('sample idea text')
+        return [
+            t for t in self.generate_templates(category, count)
+            if fill_template(t, sample_slots) is not None
+        ]
+
+    def _add(self, category: str, templates: List[Dict]):
+        with self._lock:
+            self._pool(category).extend(templates)
+
+    def refine_async(self, idea: str, generate_projects: Callable[[], List[Dict]]):
+        """
+        Run the live LLM generation for an idea in the background and keep
+        its output as templates for future ideas in the same category.
+        """
+        def refine():
+            try:
+                projects = generate_projects()
+                self._add(categorize(idea), [templatize(idea, p) for p in projects])
+                self.stats['refinements'] += 1
+            except Exception as e:
+                print(f"Error refining fake projects: {e}")
+
+        self._executor.submit(refine)
+
+    def get_stats(self) -> Dict:
+        """Hit rate, refill counters and current bucket sizes"""
+        with self._lock:
+            requests = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / requests, 3) if requests else None,
+                'pool_sizes': {category: len(pool) for category, pool in self._pools.items()}
+            }
@@ -1,152 +1,376 @@
 import google.generativeai as genai
-from typing import List, Dict
+from google.api_core import exceptions as google_exceptions
+from typing import Any, Callable, List, Dict, Optional
+from services.rate_limiter import TokenBucket, RateLimitTimeout, UpstreamRateLimited
+from services.generic_classifier import VerdictLog
+from services.prompt_budget import (
+    PromptStats, compact_search_context, estimate_tokens, truncate_to_tokens, usage_tokens
+)
 import json
 import re
+import time
+
+# Per-call model tier and output token cap. Simple classifications run on the
+# light model with a tiny output budget; generation runs on the standard model.
+CALL_PROFILES = {
+    'search_queries': ('light', 256),
+    'is_generic': ('light', 32),
+    'uniqueness': ('standard', 256),
+    'fake_projects': ('standard', 1024),
+    'fake_project_templates': ('standard', 2048),
+    'is_generic_batch': ('light', 512),
+    'search_queries_batch': ('light', 2048),
+}
+
+# Public API host, used for reachability checks
+API_ENDPOINT = 'https://generativelanguage.googleapis.com/'
+
+# Longest idea text sent to the model
+IDEA_TOKENS = 200
+
+# Fixed instruction blocks. Each prompt is one of these prefixes followed by
+# the per-request input, so the repeated part is identical on every call.
+SEARCH_QUERIES_PREFIX = """List the BIGGEST, best-known companies that already do the user's idea, as search queries that find their OFFICIAL WEBSITES.
+Rules: 7-10 queries; household company names only; no generic terms.
+Respond in JSON: {"queries": ["Instagram", "Facebook", "Snapchat"]}
+
+Idea: """
+
+UNIQUENESS_PREFIX = """Decide whether an idea is unique, given web search results.
+Rules: NOT unique only if a result clearly implements the same idea; generic or unrelated results do not count; no clear implementation → unique.
+Respond in JSON: {"is_unique": true/false, "reasoning": "one sentence"}
 
-class GeminiService:
-    """Service for interacting with Google Gemini API"""
+"""
 
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+GENERIC_PREFIX = """Classify a product idea. is_generic is true only if the EXACT idea is a well-known product category that already exists (e.g. "a social media app", "a ride sharing service", "a food delivery app").
+It is false if the idea uses futuristic or impossible technology (telepathy, teleportation, time travel...), is highly specific or novel, combines existing concepts in a new way, or is absurd.
+Examples: "An app for sharing photos" → true; "A telepathic painting device" → false; "A pizza delivery drone with AI" → false.
+Respond in JSON: {"is_generic": true/false}
 
-    @staticmethod
-    def strip_html_tags(text: str) -> str:
-        if not text:
-            return text
-        return re.sub(r'<[^>]+>', '', text)
+Idea: """
 
-    def generate_search_queries(self, idea: str) -> List[str]:
-        prompt = f"""You are helping to find the BIGGEST, most well-known competitors to a user's idea.
+GENERIC_BATCH_PREFIX = GENERIC_PREFIX.split("Respond in JSON")[0] + """Classify each numbered idea below.
+Respond in JSON: {"results": [{"id": 1, "is_generic": true/false}]}
 
-User's Idea:
-{idea}
+Ideas:
+"""
+
+SEARCH_QUERIES_BATCH_PREFIX = SEARCH_QUERIES_PREFIX.split("Respond in JSON")[0] + """Do this for each numbered idea below.
+Respond in JSON: {"results": [{"id": 1, "queries": ["Instagram", "Facebook"]}]}
 
-Task: Generate 7-10 search queries that will find the OFFICIAL WEBSITES of the TOP major brands/companies that already do this.
+Ideas:
+"""
 
-Rules:
-- Use ONLY company names
-- Use household names only
-- No generic terms
+FAKE_PROJECTS_PREFIX = """Invent fictional companies that claim to have already built the user's idea.
+Respond in JSON: {"projects": [{"title": "...", "description": "...", "status": "..."}]}
 
-Respond in JSON:
-{{ "queries": ["Instagram", "Facebook", "Snapchat"] }}
 """
-        try:
-            response = self.model.generate_content(prompt)
-            text = response.text.strip()
 
-            if text.startswith("```json"):
-                text = text.replace("```json", "").replace("```", "").strip()
+FAKE_PROJECT_TEMPLATES_PREFIX = """Write templates for fictional companies that claim to have already built a user's idea.
+Use these placeholders, which will be filled in later:
+- {Term} / {term}: the idea's main keyword (capitalized / lowercase)
+- {Term2} / {term2}: a secondary keyword
+- {phrase} / {Phrase}: a short phrase describing the idea
+- {year}: a recent year
+Rules: every title contains {Term} or {Term2}; every description contains {phrase}; no other curly braces.
+Respond in JSON: {"templates": [{"title": "{Term}Hub", "description": "A startup offering {phrase}...", "status": "Launched in {year}"}]}
 
-            return json.loads(text).get("queries", [idea])
-        except Exception:
-            return [idea]
+"""
 
-    def analyze_idea_uniqueness(self, idea: str, search_results: List[Dict]) -> Dict:
-        search_context = "\n\n".join([
-            f"Title: {r['title']}\nDescription: {r['description']}\nURL: {r['url']}"
-            for r in search_results[:5]
-        ])
 
-        prompt = f"""Determine whether this idea is unique.
+class GeminiService:
+    """Service for interacting with Google Gemini API"""
+
+    def __init__(self, api_key: str, rate_limit: Optional[TokenBucket] = None,
+                 model: str = 'gemini-1.5-flash', light_model: str = 'gemini-1.5-flash-8b',
+                 context_tokens: int = 400, stats: Optional[PromptStats] = None,
+                 verdict_log: Optional[VerdictLog] = None):
+        genai.configure(api_key=api_key)
+        self.rate_limit = rate_limit
+        self.context_tokens = context_tokens
+        self.stats = stats or PromptStats()
+        self.verdict_log = verdict_log
+
+        tiers = {'standard': model, 'light': light_model}
+        self.models = {
+            call: genai.GenerativeModel(tiers[tier], generation_config={'max_output_tokens': max_output})
+            for call, (tier, max_output) in CALL_PROFILES.items()
+        }
+
+    def _generate(self, call: str, prompt: str):
+        """Call the model for `call`, queueing for the shared Gemini quota first"""
+        if self.rate_limit:
+            self.rate_limit.acquire()
+
+        start = time.monotonic()
+        try:
+            response = self.models[call].generate_content(prompt)
+        except Exception as e:
+            self._record(call, prompt, start, None)
+            self._check_quota_error(e)
+            raise
+        self._record(call, prompt, start, response)
+        return response
 
-Idea:
-{idea}
+    @staticmethod
+    def _check_quota_error(e: Exception):
+        """A 429 / quota error must not turn into a fallback verdict such as is_unique=True"""
+        if isinstance(e, (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)):
+            raise UpstreamRateLimited(f"gemini quota exhausted: {e}") from e
+
+    def _record(self, call: str, prompt: str, start: float, response):
+        latency_ms = (time.monotonic() - start) * 1000
+        model = self.models[call].model_name
+        if response is None:
+            self.stats.record(call, model, latency_ms, estimate_tokens(prompt), ok=False)
+            return
+        prompt_tokens, output_tokens, estimated = usage_tokens(response, prompt)
+        self.stats.record(call, model, latency_ms, prompt_tokens, output_tokens, estimated)
 
-Search Results:
-{search_context if search_results else "None"}
+    @staticmethod
+    def _response_json(response) -> Any:
+        """Parse a model response as JSON, dropping a ```json fence if present"""
+        text = response.text.strip()
 
-Rules:
-- NOT unique only if results clearly implement the same idea
-- Generic or unrelated results do NOT count
-- If no clear implementation exists → unique
+        if text.startswith("```json"):
+            text = text.replace("```json", "").replace("```", "").strip()
 
-Respond in JSON:
-{{ "is_unique": true/false, "reasoning": "..." }}
-"""
+        return json.loads(text)
 
+    def _complete(self, call: str, prompt: str, parse: Callable[[Any], Any],
+                  fallback: Callable[[], Any]) -> Any:
+        """
+        Run a prompt and parse its JSON answer.
+        Any failure except a rate limit (local timeout or upstream 429) returns the fallback.
+        """
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text.strip()
+            return parse(self._response_json(self._generate(call, prompt)))
+        except RateLimitTimeout:
+            raise
+        except Exception:
+            return fallback()
 
-            if text.startswith("```json"):
-                text = text.replace("```json", "").replace("```", "").strip()
+    @staticmethod
+    def strip_html_tags(text: str) -> str:
+        if not text:
+            return text
+        return re.sub(r'<[^>]+>', '', text)
 
-            return json.loads(text)
-        except Exception:
-            return {
-                "is_unique": True,
-                "reasoning": "No clear implementation found."
+    def _parse_generic(self, idea: str, data: Dict) -> bool:
+        """Read the is_generic verdict, logging it as training data for the local classifier"""
+        is_generic = bool(data.get("is_generic", False))
+        if self.verdict_log:
+            self.verdict_log.append(idea, is_generic, self.models['is_generic'].model_name)
+        return is_generic
+
+    def _clean_projects(self, projects: List[Dict]) -> List[Dict]:
+        return [
+            {
+                "title": self.strip_html_tags(p.get("title", "")),
+                "description": self.strip_html_tags(p.get("description", "")),
+                "status": self.strip_html_tags(p.get("status", ""))
             }
+            for p in projects
+        ]
 
-    def is_generic_idea(self, idea: str) -> bool:
-        """
-        Detects whether an idea is a well-known, already-solved product category
-        """
-        prompt = f"""Classify this product idea.
+    # ---- Prompts ----
 
-Idea:
-{idea}
+    @staticmethod
+    def _search_queries_prompt(idea: str) -> str:
+        return SEARCH_QUERIES_PREFIX + truncate_to_tokens(idea, IDEA_TOKENS)
 
-Return TRUE only if this EXACT idea is a well-known, common product category that already exists
-in the market (e.g., "a social media app", "a ride sharing service", "a food delivery app").
+    def _uniqueness_prompt(self, idea: str, search_results: List[Dict]) -> str:
+        search_context = compact_search_context(search_results, self.context_tokens)
+        return (UNIQUENESS_PREFIX + f"Idea: {truncate_to_tokens(idea, IDEA_TOKENS)}\n\n"
+                f"Search results:\n{search_context}")
 
-Return FALSE if:
-- The idea contains futuristic/impossible technology (telepathic, teleportation, time travel, etc.)
-- The idea is highly specific or novel
-- The idea combines existing concepts in a new way
-- The idea is absurd or nonsensical
+    @staticmethod
+    def _generic_prompt(idea: str) -> str:
+        return GENERIC_PREFIX + truncate_to_tokens(idea, IDEA_TOKENS)
 
-Examples:
-- "A social media app" → TRUE (generic, already exists)
-- "A telepathic painting device" → FALSE (futuristic technology, doesn't exist)
-- "An app for sharing photos" → TRUE (Instagram exists)
-- "A pizza delivery drone with AI" → FALSE (specific/novel combination)
+    @staticmethod
+    def _numbered_ideas(ideas: List[str]) -> str:
+        return "\n".join(f"{i}. {truncate_to_tokens(idea, IDEA_TOKENS)}" for i, idea in enumerate(ideas, 1))
 
-Respond in JSON:
-{{ "is_generic": true/false }}
-"""
+    @staticmethod
+    def _results_by_id(data: Dict, count: int, field: str) -> Dict[int, Any]:
+        """Map a batched answer's results to 0-based idea positions, skipping malformed entries"""
+        answers = {}
+        for item in data.get("results", []):
+            if isinstance(item, dict) and isinstance(item.get("id"), int) and field in item:
+                if 1 <= item["id"] <= count:
+                    answers[item["id"] - 1] = item[field]
+        return answers
+
+    def _parse_generic_batch(self, ideas: List[str], data: Dict) -> List[bool]:
+        answers = self._results_by_id(data, len(ideas), "is_generic")
+        verdicts = []
+        for i, idea in enumerate(ideas):
+            if i in answers:
+                verdicts.append(self._parse_generic(idea, {"is_generic": answers[i]}))
+            else:
+                verdicts.append(True)  # fail-safe, as for a single idea
+        return verdicts
+
+    def _parse_queries_batch(self, ideas: List[str], data: Dict) -> List[List[str]]:
+        answers = self._results_by_id(data, len(ideas), "queries")
+        return [
+            answers[i] if isinstance(answers.get(i), list) and answers[i] else [idea]
+            for i, idea in enumerate(ideas)
+        ]
 
-        try:
-            response = self.model.generate_content(prompt)
-            text = response.text.strip()
+    @staticmethod
+    def _fake_projects_prompt(idea: str, count: int) -> str:
+        return FAKE_PROJECTS_PREFIX + f"Count: {count}\nIdea: {truncate_to_tokens(idea, IDEA_TOKENS)}"
 
-            if text.startswith("```json"):
-                text = text.replace("```json", "").replace("```", "").strip()
+    @staticmethod
+    def _fake_project_templates_prompt(category: str, count: int) -> str:
+        return FAKE_PROJECT_TEMPLATES_PREFIX + f'Count: {count}\nCategory: "{category}"'
 
-            return json.loads(text).get("is_generic", False)
-        except Exception:
-            return True  # fail-safe
+    # ---- Public API ----
 
-    def generate_fake_projects(self, idea: str, count: int = 3) -> List[Dict]:
-        prompt = f"""Create {count} fictional companies that claim to have built this idea.
+    def generate_search_queries(self, idea: str) -> List[str]:
+        return self._complete(
+            'search_queries',
+            self._search_queries_prompt(idea),
+            lambda data: data.get("queries", [idea]),
+            lambda: [idea]
+        )
 
-Idea:
-{idea}
+    def analyze_idea_uniqueness(self, idea: str, search_results: List[Dict]) -> Dict:
+        return self._complete(
+            'uniqueness',
+            self._uniqueness_prompt(idea, search_results),
+            lambda data: data,
+            lambda: {
+                "is_unique": True,
+                "reasoning": "No clear implementation found."
+            }
+        )
 
-Respond in JSON:
-{{ "projects": [{{"title":"...","description":"...","status":"..."}}] }}
-"""
+    def is_generic_idea(self, idea: str) -> bool:
+        """
+        Detects whether an idea is a well-known, already-solved product category
+        """
+        return self._complete(
+            'is_generic',
+            self._generic_prompt(idea),
+            lambda data: self._parse_generic(idea, data),
+            lambda: True  # fail-safe
+        )
+
+    def is_generic_batch(self, ideas: List[str]) -> List[bool]:
+        """is_generic_idea for several ideas in one prompt"""
+        return self._complete(
+            'is_generic_batch',
+            GENERIC_BATCH_PREFIX + self._numbered_ideas(ideas),
+            lambda data: self._parse_generic_batch(ideas, data),
+            lambda: [True] * len(ideas)  # fail-safe
+        )
+
+    def generate_search_queries_batch(self, ideas: List[str]) -> List[List[str]]:
+        """generate_search_queries for several ideas in one prompt"""
+        return self._complete(
+            'search_queries_batch',
+            SEARCH_QUERIES_BATCH_PREFIX + self._numbered_ideas(ideas),
+            lambda data: self._parse_queries_batch(ideas, data),
+            lambda: [[idea] for idea in ideas]
+        )
 
-        try:
-            response = self.model.generate_content(prompt)
-            text = response.text.strip()
+    def generate_fake_projects(self, idea: str, count: int = 3) -> List[Dict]:
+        return self._complete(
+            'fake_projects',
+            self._fake_projects_prompt(idea, count),
+            lambda data: self._clean_projects(data.get("projects", [])),
+            lambda: [{
+                "title": "Confidential Industry Project",
+                "description": "A private company has patented a similar concept.",
+                "status": "Patented (details confidential)"
+            }]
+        )
+
+    def generate_fake_project_templates(self, category: str, count: int = 5) -> List[Dict]:
+        """
+        Generate reusable fake-project templates for a coarse idea category.
+        Templates use {Term}/{term}/{Term2}/{term2}/{phrase}/{Phrase}/{year} slots
+        that are filled locally per idea. Errors propagate to the caller.
+        """
+        prompt = self._fake_project_templates_prompt(category, count)
+        data = self._response_json(self._generate('fake_project_templates', prompt))
+        return self._clean_projects(data.get("templates", []))
 
-            if text.startswith("```json"):
-                text = text.replace("```json", "").replace("```", "").strip()
 
-            projects = json.loads(text).get("projects", [])
+class AsyncGeminiService(GeminiService):
+    """
+    Async variant of GeminiService for the ASGI serving mode.
+    Uses the same prompts and parsing, but awaits the model over gRPC aio.
+    """
 
-            for p in projects:
-                p["title"] = self.strip_html_tags(p.get("title", ""))
-                p["description"] = self.strip_html_tags(p.get("description", ""))
-                p["status"] = self.strip_html_tags(p.get("status", ""))
+    async def _agenerate(self, call: str, prompt: str):
+        """Call the model asynchronously, queueing for the shared Gemini quota first"""
+        if self.rate_limit:
+            await self.rate_limit.acquire_async()
 
-            return projects
+        start = time.monotonic()
+        try:
+            response = await self.models[call].generate_content_async(prompt)
+        except Exception as e:
+            self._record(call, prompt, start, None)
+            self._check_quota_error(e)
+            raise
+        self._record(call, prompt, start, response)
+        return response
+
+    async def _acomplete(self, call: str, prompt: str, parse: Callable[[Any], Any],
+                         fallback: Callable[[], Any]) -> Any:
+        """Async counterpart of GeminiService._complete"""
+        try:
+            return parse(self._response_json(await self._agenerate(call, prompt)))
+        except RateLimitTimeout:
+            raise
         except Exception:
-            return [{
+            return fallback()
+
+    async def generate_search_queries(self, idea: str) -> List[str]:
+        return await self._acomplete(
+            'search_queries',
+            self._search_queries_prompt(idea),
+            lambda data: data.get("queries", [idea]),
+            lambda: [idea]
+        )
+
+    async def analyze_idea_uniqueness(self, idea: str, search_results: List[Dict]) -> Dict:
+        return await self._acomplete(
+            'uniqueness',
+            self._uniqueness_prompt(idea, search_results),
+            lambda data: data,
+            lambda: {
+                "is_unique": True,
+                "reasoning": "No clear implementation found."
+            }
+        )
+
+    async def is_generic_idea(self, idea: str) -> bool:
+        return await self._acomplete(
+            'is_generic',
+            self._generic_prompt(idea),
+            lambda data: self._parse_generic(idea, data),
+            lambda: True  # fail-safe
+        )
+
+    async def generate_fake_projects(self, idea: str, count: int = 3) -> List[Dict]:
+        return await self._acomplete(
+            'fake_projects',
+            self._fake_projects_prompt(idea, count),
+            lambda data: self._clean_projects(data.get("projects", [])),
+            lambda: [{
                 "title": "Confidential Industry Project",
                 "description": "A private company has patented a similar concept.",
                 "status": "Patented (details confidential)"
             }]
+        )
+
+    async def generate_fake_project_templates(self, category: str, count: int = 5) -> List[Dict]:
+        prompt = self._fake_project_templates_prompt(category, count)
+        data = self._response_json(await self._agenerate('fake_project_templates', prompt))
+        return self._clean_projects(data.get("templates", []))
@@ -0,0 +1,223 @@
+import glob
+import json
+import os
+import re
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Bump when featurize() changes; artifacts built with another version are not loaded
+FEATURE_VERSION = 1
+
+ARTIFACT_NAME = 'generic_classifier'
+
+
+def featurize(text: str, mask: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hashed features of an idea: words, word bigrams and character trigrams
+    of each word, as (sorted feature ids, L2-normalized log counts).
+    crc32 is used for hashing so ids are stable across processes.
+    """
+    words = WORD_RE.findall(text.lower())
+    grams = [f"w:{w}" for w in words]
+    grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"<{w}>"
+        grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+
+    if not grams:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    ids = np.fromiter((zlib.crc32(g.encode()) & mask for g in grams), dtype=np.int64, count=len(grams))
+    ids, counts = np.unique(ids, return_counts=True)
+    values = 1 + np.log(counts)
+    return ids, values / np.linalg.norm(values)
+
+
+def _sigmoid(z):
+    return 1 / (1 + np.exp(-np.clip(z, -30, 30)))
+
+
+class GenericIdeaClassifier:
+    """
+    Hashed n-gram logistic regression that predicts Gemini's is_generic verdict.
+
+    classify() only answers when the model is confident; otherwise it returns
+    None and the caller asks Gemini (whose verdict is logged for the next
+    training run). Artifacts are versioned .npz files written by
+    train_generic_classifier.py; the highest version in the directory is loaded.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float, version: int = 0,
+                 confidence: float = 0.85, metadata: Optional[Dict] = None):
+        self.weights = weights
+        self.bias = bias
+        self.mask = len(weights) - 1
+        self.version = version
+        self.confidence = confidence
+        self.metadata = metadata or {}
+        self.stats = {'local': 0, 'deferred': 0}
+
+    def predict_proba(self, text: str) -> float:
+        ids, values = featurize(text, self.mask)
+        return float(_sigmoid(values @ self.weights[ids] + self.bias))
+
+    def classify(self, text: str) -> Optional[bool]:
+        """True/False when the model is confident enough, None to defer to the LLM"""
+        p = self.predict_proba(text)
+        if max(p, 1 - p) < self.confidence:
+            self.stats['deferred'] += 1
+            return None
+        self.stats['local'] += 1
+        return p >= 0.5
+
+    def get_stats(self) -> Dict:
+        decided = self.stats['local'] + self.stats['deferred']
+        return {
+            'version': self.version,
+            'confidence': self.confidence,
+            **self.stats,
+            'local_rate': round(self.stats['local'] / decided, 3) if decided else None,
+            'trained_at': self.metadata.get('trained_at'),
+            'samples': self.metadata.get('samples')
+        }
+
+    # ---- Training ----
+
+    @classmethod
+    def train(cls, texts: List[str], labels: List[bool], n_features: int = 2 ** 18,
+              epochs: int = 300, learning_rate: float = 0.5, l2: float = 1e-4) -> 'GenericIdeaClassifier':
+        """Full-batch Adagrad on the sparse hashed features, with balanced class weights"""
+        mask = n_features - 1
+        rows, cols, vals = [], [], []
+        for i, text in enumerate(texts):
+            ids, values = featurize(text, mask)
+            rows.append(np.full(len(ids), i))
+            cols.append(ids)
+            vals.append(values)
+        rows, cols, vals = np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)
+
+        y = np.asarray(labels, dtype=float)
+        n = len(y)
+        positives = max(y.sum(), 1)
+        negatives = max(n - y.sum(), 1)
+        sample_weight = np.where(y == 1, n / (2 * positives), n / (2 * negatives))
+
+        w = np.zeros(n_features)
+        b = 0.0
+        g_w = np.full(n_features, 1e-8)
+        g_b = 1e-8
+        for _ in range(epochs):
+            z = np.bincount(rows, weights=vals * w[cols], minlength=n) + b
+            err = (_sigmoid(z) - y) * sample_weight / n
+            grad_w = np.bincount(cols, weights=vals * err[rows], minlength=n_features) + l2 * w
+            grad_b = err.sum()
+            g_w += grad_w ** 2
+            g_b += grad_b ** 2
+            w -= learning_rate * grad_w / np.sqrt(g_w)
+            b -= learning_rate * grad_b / np.sqrt(g_b)
+
+        return cls(w, b)
+
+    def evaluate(self, texts: List[str], labels: List[bool]) -> Dict:
+        """Accuracy overall, and coverage/accuracy of the confident (local) answers"""
+        probs = np.array([self.predict_proba(t) for t in texts])
+        y = np.asarray(labels, dtype=bool)
+        predicted = probs >= 0.5
+        confident = np.maximum(probs, 1 - probs) >= self.confidence
+        return {
+            'samples': len(y),
+            'accuracy': round(float((predicted == y).mean()), 3) if len(y) else None,
+            'coverage': round(float(confident.mean()), 3) if len(y) else None,
+            'confident_accuracy': (
+                round(float((predicted[confident] == y[confident]).mean()), 3) if confident.any() else None
+            )
+        }
+
+    # ---- Artifacts ----
+
+    def save(self, artifact_dir: str, metadata: Dict) -> str:
+        """Write the next version of the artifact; returns its path"""
+        os.makedirs(artifact_dir, exist_ok=True)
+        version = max([v for v, _ in _artifact_versions(artifact_dir)], default=0) + 1
+        path = os.path.join(artifact_dir, f"{ARTIFACT_NAME}-v{version}.npz")
+
+        metadata = {**metadata, 'version': version, 'feature_version': FEATURE_VERSION,
+                    'trained_at': datetime.utcnow().isoformat()}
+        nonzero = np.flatnonzero(self.weights)
+        np.savez_compressed(
+            path,
+            n_features=len(self.weights),
+            indices=nonzero.astype(np.int32),
+            values=self.weights[nonzero].astype(np.float32),
+            bias=self.bias,
+            metadata=json.dumps(metadata)
+        )
+        self.version = version
+        self.metadata = metadata
+        return path
+
+    @classmethod
+    def load(cls, path: str, confidence: float = 0.85) -> 'GenericIdeaClassifier':
+        with np.load(path) as artifact:
+            metadata = json.loads(str(artifact['metadata']))
+            if metadata.get('feature_version') != FEATURE_VERSION:
+                raise ValueError(f"{path} was built with feature version {metadata.get('feature_version')}")
+            weights = np.zeros(int(artifact['n_features']))
+            weights[artifact['indices']] = artifact['values']
+            return cls(weights, float(artifact['bias']), metadata['version'], confidence, metadata)
+
+    @classmethod
+    def load_latest(cls, artifact_dir: str, confidence: float = 0.85) -> Optional['GenericIdeaClassifier']:
+        """Load the highest artifact version in artifact_dir, or None if there is none"""
+        versions = sorted(_artifact_versions(artifact_dir))
+        if not versions:
+            return None
+        return cls.load(versions[-1][1], confidence)
+
+
+def _artifact_versions(artifact_dir: str) -> List[Tuple[int, str]]:
+    versions = []
+    for path in glob.glob(os.path.join(artifact_dir, f"{ARTIFACT_NAME}-v*.npz")):
+        match = re.search(r'-v(\d+)\.npz$', path)
+        if match:
+            versions.append((int(match.group(1)), path))
+    return versions
+
+
+class VerdictLog:
+    """Append-only JSONL log of LLM is_generic verdicts, the classifier's training data"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def append(self, idea_text: str, is_generic: bool, model: str):
+        record = {'idea': idea_text, 'is_generic': bool(is_generic), 'model': model,
+                  'created_at': datetime.utcnow().isoformat()}
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._file = open(self.path, 'a', buffering=1)
+            self._file.write(json.dumps(record) + '\n')
+
+    @staticmethod
+    def read(paths: Iterable[str]) -> Dict[str, bool]:
+        """Latest verdict per distinct idea (case- and whitespace-insensitive)"""
+        verdicts = {}
+        for path in paths:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn line
+                    key = ' '.join(record['idea'].lower().split())
+                    verdicts[key] = record['is_generic']
+        return verdicts
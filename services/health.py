@@ -0,0 +1,89 @@
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+import requests
+
+
+def check_http(url: str, timeout: float) -> Dict:
+    """
+    Reachability of an upstream API. Any answer below 500 counts as up: the
+    probe sends no API key, so 401/403/404 still prove the service responds.
+    """
+    response = requests.get(url, timeout=timeout)
+    if response.status_code >= 500:
+        raise RuntimeError(f"HTTP {response.status_code}")
+    return {'http_status': response.status_code}
+
+
+class HealthMonitor:
+    """
+    Runs dependency checks on a background thread and caches the results.
+
+    Probes only read the cache, so a load balancer polling readiness costs no
+    database connections or upstream requests. Each check is a callable that
+    raises on failure and may return a dict of details. A result older than
+    `stale_after` seconds (a hung check, or a dead thread) counts as failed.
+    """
+
+    def __init__(self, checks: Dict[str, Callable[[], Optional[Dict]]], interval: float,
+                 required: Iterable[str], stale_after: Optional[float] = None):
+        self.checks = checks
+        self.interval = interval
+        self.required = [name for name in required if name in checks]
+        self.stale_after = stale_after or interval * 3
+        self.started_at = time.monotonic()
+        self.results: Dict[str, Dict] = {}
+        self._stop = threading.Event()
+
+    def start(self):
+        """Check the required dependencies once, synchronously, then keep checking in the background"""
+        self.check_all(self.required)
+        threading.Thread(target=self._run, name='health-monitor', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def check_all(self, names: Optional[Iterable[str]] = None):
+        for name in (self.checks if names is None else names):
+            check = self.checks[name]
+            start = time.perf_counter()
+            try:
+                details = check() or {}
+                result = {'status': 'ok', **details}
+            except Exception as e:
+                result = {'status': 'fail', 'error': f"{type(e).__name__}: {e}"}
+            result['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            result['checked_at'] = datetime.utcnow().isoformat()
+            result['_checked'] = time.monotonic()
+            # Swap in a new dict so readers never see a half-written result
+            self.results = {**self.results, name: result}
+
+    def is_ok(self, name: str) -> bool:
+        return self._current(name)['status'] == 'ok'
+
+    def readiness(self) -> Dict:
+        """Cached status of every dependency; ready when all required ones are ok"""
+        dependencies = {name: self._current(name) for name in self.checks}
+        ready = all(dependencies[name]['status'] == 'ok' for name in self.required)
+        return {
+            'status': 'ready' if ready else 'not_ready',
+            'dependencies': dependencies,
+            'required': self.required
+        }
+
+    def _current(self, name: str) -> Dict:
+        result = self.results.get(name)
+        if result is None:
+            return {'status': 'pending'}
+        current = {k: v for k, v in result.items() if k != '_checked'}
+        if time.monotonic() - result['_checked'] > self.stale_after:
+            current['status'] = 'stale'
+        return current
+
+    def _run(self):
+        while True:
+            self.check_all()
+            if self._stop.wait(self.interval):
+                return
@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import Flask, Response, render_template, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript',
+    'application/json', 'application/javascript', 'application/x-ndjson'
+}
+
+
+class ResponseOptimizer:
+    """
+    After-request middleware that cuts bytes per page view and per poll.
+
+    - Compresses text responses above min_size with brotli or gzip, depending
+      on the client's Accept-Encoding.
+    - Gives responses from the conditional endpoints a strong ETag and answers
+      a matching If-None-Match with 304. The ETag includes the content
+      encoding, so each representation has its own tag.
+    - Keeps the compressed bodies of recently seen ETags, so repeated pages
+      and unchanged admin lists are not compressed again.
+    - Renders context-free templates once per process (render_static_page).
+    """
+
+    MAX_CACHED_BODIES = 64
+
+    def __init__(self, app: Optional[Flask] = None, min_size: int = 1024,
+                 conditional_endpoints: Iterable[str] = ()):
+        self.min_size = min_size
+        self.conditional_endpoints = set(conditional_endpoints)
+        self._pages: Dict[str, str] = {}
+        self._bodies: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        self.app = app
+        app.after_request(self.process_response)
+
+    def render_static_page(self, template_name: str) -> str:
+        """Render a template that takes no context once, then serve it from memory"""
+        if self.app.debug:
+            return render_template(template_name)  # pick up template edits while developing
+
+        page = self._pages.get(template_name)
+        if page is None:
+            page = render_template(template_name)
+            self._pages[template_name] = page
+        return page
+
+    def process_response(self, response: Response) -> Response:
+        if response.status_code != 200 or response.is_streamed or response.direct_passthrough:
+            return response
+        if 'Content-Encoding' in response.headers:
+            return response
+
+        body = response.get_data()
+        encoding = self._negotiate_encoding(response, len(body))
+        if encoding or response.mimetype in COMPRESSIBLE_MIMETYPES:
+            response.vary.add('Accept-Encoding')
+
+        etag = None
+        if request.endpoint in self.conditional_endpoints:
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.make_conditional(request)
+            if response.status_code == 304:
+                return response
+
+        if encoding:
+            response.set_data(self._compressed(body, encoding, etag))
+            response.headers['Content-Encoding'] = encoding
+
+        return response
+
+    def _negotiate_encoding(self, response: Response, size: int) -> Optional[str]:
+        if size < self.min_size or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return None
+
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def _compressed(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        """Compress a body, reusing the cached result for a known ETag"""
+        key = (etag, encoding)
+        if etag is not None:
+            with self._lock:
+                cached = self._bodies.get(key)
+                if cached is not None:
+                    self._bodies.move_to_end(key)
+                    return cached
+
+        if encoding == 'br':
+            compressed = brotli.compress(body, quality=5)
+        else:
+            compressed = gzip.compress(body, compresslevel=6)
+
+        if etag is not None:
+            with self._lock:
+                self._bodies[key] = compressed
+                while len(self._bodies) > self.MAX_CACHED_BODIES:
+                    self._bodies.popitem(last=False)
+
+        return compressed
@@ -0,0 +1,214 @@
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import defer
+
+from models import Idea, IdeaArchiveSegment
+
+
+def encode_segment(rows: List[Tuple[int, str, datetime]]) -> bytes:
+    """gzip-compressed JSONL, one idea per line"""
+    lines = (
+        json.dumps({'id': idea_id, 'idea_text': text, 'created_at': created_at.isoformat()})
+        for idea_id, text, created_at in rows
+    )
+    return gzip.compress('\n'.join(lines).encode('utf-8'))
+
+
+def decode_segment(data: bytes) -> List[Tuple[int, str, datetime]]:
+    rows = []
+    for line in gzip.decompress(data).decode('utf-8').splitlines():
+        record = json.loads(line)
+        rows.append((record['id'], record['idea_text'], datetime.fromisoformat(record['created_at'])))
+    return rows
+
+
+def _to_dict(idea_id: int, text: str, created_at: datetime, archived: bool) -> Dict:
+    return {'id': idea_id, 'idea_text': text, 'created_at': created_at.isoformat(), 'archived': archived}
+
+
+def _in_range(created_at: datetime, since: Optional[datetime], until: Optional[datetime]) -> bool:
+    return (since is None or created_at >= since) and (until is None or created_at < until)
+
+
+class IdeaArchive:
+    """
+    Two-tier storage for ideas.
+
+    The hot `ideas` table only keeps the last `retention_days` of ideas (and
+    at most `hot_max_rows` rows, if set). archive() moves older rows, oldest
+    first, into IdeaArchiveSegment rows. Each segment holds up to
+    `segment_rows` ideas as gzip-compressed JSONL, and its id and date bounds
+    index it. Segments are only ever appended.
+
+    get() and list() read both tiers, so callers do not need to know where an
+    idea lives. Hot ideas are newer than archived ones, so list() reads the
+    hot table first and only decompresses the segments the page reaches.
+    """
+
+    CACHED_SEGMENTS = 8
+
+    def __init__(self, retention_days: int = 90, hot_max_rows: int = 0,
+                 segment_rows: int = 5000, interval: float = 3600):
+        self.retention_days = retention_days
+        self.hot_max_rows = hot_max_rows
+        self.segment_rows = segment_rows
+        self.interval = interval
+        self._segments: 'OrderedDict[int, List]' = OrderedDict()  # decoded segment cache
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self, job: Callable[[], Dict]):
+        """Run `job` (an archive() pass inside an app context) every `interval` seconds"""
+        threading.Thread(target=self._run, args=(job,), name='idea-archiver', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def archive(self, session) -> Dict:
+        """
+        Move every idea past the retention bounds into new segments, one
+        transaction per segment. Rows are claimed with DELETE ... RETURNING,
+        so concurrent runs from several workers never archive a row twice.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+        if self.hot_max_rows:
+            boundary = session.scalar(
+                select(Idea.created_at).order_by(Idea.created_at.desc()).offset(self.hot_max_rows).limit(1)
+            )
+            if boundary is not None:
+                cutoff = max(cutoff, boundary + timedelta(microseconds=1))
+
+        moved = segments = 0
+        while True:
+            oldest = select(Idea.id).where(Idea.created_at < cutoff).order_by(
+                Idea.created_at, Idea.id
+            ).limit(self.segment_rows)
+            rows = session.execute(
+                delete(Idea).where(Idea.id.in_(oldest)).returning(Idea.id, Idea.idea_text, Idea.created_at),
+                execution_options={'synchronize_session': False}
+            ).all()
+            if not rows:
+                session.rollback()
+                break
+
+            rows = sorted(rows, key=lambda r: (r[2], r[0]), reverse=True)
+            session.add(IdeaArchiveSegment(
+                first_id=min(r[0] for r in rows),
+                last_id=max(r[0] for r in rows),
+                first_created_at=rows[-1][2],
+                last_created_at=rows[0][2],
+                row_count=len(rows),
+                data=encode_segment(rows)
+            ))
+            session.commit()
+            moved += len(rows)
+            segments += 1
+
+        return {'rows': moved, 'segments': segments}
+
+    def get(self, session, idea_id: int) -> Optional[Dict]:
+        """Look up one idea by id in either tier"""
+        idea = session.get(Idea, idea_id)
+        if idea is not None:
+            return _to_dict(idea.id, idea.idea_text, idea.created_at, archived=False)
+
+        candidates = session.scalars(
+            select(IdeaArchiveSegment).options(defer(IdeaArchiveSegment.data)).where(
+                IdeaArchiveSegment.first_id <= idea_id, IdeaArchiveSegment.last_id >= idea_id
+            )
+        )
+        for segment in candidates:
+            for row in self._load(session, segment):
+                if row[0] == idea_id:
+                    return _to_dict(*row, archived=True)
+        return None
+
+    def list(self, session, since: Optional[datetime] = None, until: Optional[datetime] = None,
+             limit: Optional[int] = None, offset: int = 0) -> Tuple[List[Dict], int]:
+        """
+        Ideas created in [since, until), newest first, across both tiers.
+        Returns (page, total matching).
+        """
+        conditions = []
+        if since is not None:
+            conditions.append(Idea.created_at >= since)
+        if until is not None:
+            conditions.append(Idea.created_at < until)
+
+        wanted = None if limit is None else offset + limit
+        total = session.scalar(select(func.count()).select_from(Idea).where(*conditions))
+
+        hot = select(Idea).where(*conditions).order_by(Idea.created_at.desc())
+        if wanted is not None:
+            hot = hot.limit(wanted)
+        items = [_to_dict(i.id, i.idea_text, i.created_at, archived=False) for i in session.scalars(hot)]
+
+        segment_conditions = []
+        if since is not None:
+            segment_conditions.append(IdeaArchiveSegment.last_created_at >= since)
+        if until is not None:
+            segment_conditions.append(IdeaArchiveSegment.first_created_at < until)
+        segments = session.scalars(
+            select(IdeaArchiveSegment).options(defer(IdeaArchiveSegment.data))
+            .where(*segment_conditions).order_by(IdeaArchiveSegment.last_created_at.desc())
+        )
+
+        for segment in segments:
+            need_rows = wanted is None or len(items) < wanted
+            fully_inside = (_in_range(segment.first_created_at, since, until) and
+                            _in_range(segment.last_created_at, since, until))
+            if fully_inside and not need_rows:
+                total += segment.row_count  # counted from the index, no decompression
+                continue
+
+            matching = [row for row in self._load(session, segment) if _in_range(row[2], since, until)]
+            total += len(matching)
+            if need_rows:
+                items.extend(_to_dict(*row, archived=True) for row in matching)
+
+        return items[offset:wanted], total
+
+    def get_stats(self, session) -> Dict:
+        archived = session.execute(
+            select(func.count(), func.coalesce(func.sum(IdeaArchiveSegment.row_count), 0),
+                   func.min(IdeaArchiveSegment.first_created_at))
+        ).one()
+        return {
+            'hot_rows': session.scalar(select(func.count()).select_from(Idea)),
+            'archived_rows': archived[1],
+            'segments': archived[0],
+            'oldest_archived': archived[2].isoformat() if archived[2] else None,
+            'retention_days': self.retention_days,
+            'hot_max_rows': self.hot_max_rows or None
+        }
+
+    def _load(self, session, segment) -> List[Tuple[int, str, datetime]]:
+        """Decoded rows of a segment (newest first); segments never change, so they cache forever"""
+        with self._lock:
+            rows = self._segments.get(segment.id)
+            if rows is not None:
+                self._segments.move_to_end(segment.id)
+                return rows
+
+        data = session.scalar(select(IdeaArchiveSegment.data).where(IdeaArchiveSegment.id == segment.id))
+        rows = decode_segment(data)
+        with self._lock:
+            self._segments[segment.id] = rows
+            while len(self._segments) > self.CACHED_SEGMENTS:
+                self._segments.popitem(last=False)
+        return rows
+
+    def _run(self, job: Callable[[], Dict]):
+        while not self._stop.wait(self.interval):
+            try:
+                result = job()
+                if result['rows']:
+                    print(f"Archived {result['rows']} ideas into {result['segments']} segments")
+            except Exception as e:
+                print(f"Error archiving ideas: {e}")
@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+
+from models import db
+
+# (version, name, apply function), in version order
+MIGRATIONS: List[Tuple[int, str, Callable]] = []
+
+# Arbitrary key for the PostgreSQL advisory lock that serializes concurrent deploys
+ADVISORY_LOCK_KEY = 72839121
+
+
+def migration(version: int, name: str):
+    """Register a schema migration. Migrations must be additive and safe to re-run."""
+    def register(fn):
+        MIGRATIONS.append((version, name, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+def create_index(conn, name: str, table: str, expression: str):
+    """
+    CREATE INDEX IF NOT EXISTS, built CONCURRENTLY on PostgreSQL so the table
+    stays writable during the build. A previous concurrent build that failed
+    leaves an INVALID index behind; that one is dropped and rebuilt.
+    """
+    if conn.dialect.name != 'postgresql':
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({expression})"))
+        return
+
+    valid = conn.execute(text(
+        "SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid WHERE c.relname = :name"
+    ), {'name': name}).scalar()
+    if valid is False:
+        print(f"   Rebuilding invalid index {name}")
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({expression})"))
+
+
+@migration(1, 'baseline tables')
+def _baseline(conn):
+    # Creates only the tables that are missing, so existing databases keep their data
+    db.metadata.create_all(bind=conn)
+
+
+@migration(2, 'hot-path indexes')
+def _hot_path_indexes(conn):
+    create_index(conn, 'ix_ideas_created_at', 'ideas', 'created_at')
+    create_index(conn, 'ix_users_created_at', 'users', 'created_at')
+    create_index(conn, 'ix_users_username_lower', 'users', 'lower(username)')
+
+
+def _ensure_version_table(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, applied_at TIMESTAMP NOT NULL)"
+    ))
+
+
+def applied_versions(conn) -> set:
+    _ensure_version_table(conn)
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def apply_migrations(engine) -> List[str]:
+    """
+    Apply every pending migration in version order and record it in
+    schema_migrations. Runs in autocommit mode (concurrent index builds cannot
+    run inside a transaction); on PostgreSQL an advisory lock keeps two
+    deploys from migrating at the same time.
+
+    Returns the names of the migrations applied.
+    """
+    applied = []
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        is_postgres = conn.dialect.name == 'postgresql'
+        if is_postgres:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {'key': ADVISORY_LOCK_KEY})
+        try:
+            done = applied_versions(conn)
+            for version, name, apply in MIGRATIONS:
+                if version in done:
+                    continue
+                apply(conn)
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"),
+                    {'v': version, 'n': name, 't': datetime.utcnow()}
+                )
+                applied.append(f"{version}: {name}")
+        finally:
+            if is_postgres:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': ADVISORY_LOCK_KEY})
+    return applied
+
+
+def schema_version(engine) -> int:
+    with engine.connect() as conn:
+        versions = applied_versions(conn)
+        conn.commit()
+    return max(versions, default=0)
@@ -0,0 +1,124 @@
+import html
+import re
+import threading
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+# Rough size of a token in English text; good enough for budgeting without a tokenizer call
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN) if text else 0
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens, at a word boundary"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    cut = text[:max_tokens * CHARS_PER_TOKEN]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' ,;:.-') + '…'
+
+
+def clean_snippet(text: str) -> str:
+    """Strip tags and entities and collapse whitespace in a search snippet"""
+    return SPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', text or ''))).strip()
+
+
+def compact_search_context(results: List[Dict], budget_tokens: int, max_results: int = 5,
+                           max_result_tokens: int = 80) -> str:
+    """
+    Render search results as one line each ("- Title (domain): description"),
+    skipping repeated titles. Each line gets at most max_result_tokens and
+    the whole block fits into budget_tokens; budget a short line leaves
+    unused goes to the lines after it.
+    """
+    entries = []
+    seen_titles = set()
+    for r in results:
+        title = clean_snippet(r.get('title', ''))
+        if not title or title.lower() in seen_titles:
+            continue
+        seen_titles.add(title.lower())
+        domain = urlparse(r.get('url', '')).netloc.lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        entries.append((title, domain, clean_snippet(r.get('description', ''))))
+        if len(entries) == max_results:
+            break
+
+    if not entries:
+        return "None"
+
+    lines = []
+    remaining = budget_tokens
+    for i, (title, domain, description) in enumerate(entries):
+        share = min(max(remaining // (len(entries) - i), 16), max_result_tokens)
+        line = f"- {title} ({domain}): {description}" if domain else f"- {title}: {description}"
+        line = truncate_to_tokens(line, share)
+        remaining -= estimate_tokens(line)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class PromptStats:
+    """
+    Per-call token and latency counters for LLM calls.
+    Token counts come from the response's usage metadata when the client
+    library provides it, and are estimated from text length otherwise.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: str, model: str, latency_ms: float, prompt_tokens: int,
+               output_tokens: int = 0, estimated: bool = True, ok: bool = True):
+        with self._lock:
+            stats = self._calls.setdefault(call, {
+                'model': model, 'calls': 0, 'errors': 0, 'prompt_tokens': 0, 'output_tokens': 0,
+                'total_latency_ms': 0.0, 'max_latency_ms': 0.0, 'estimated_tokens': estimated
+            })
+            stats['model'] = model
+            stats['calls'] += 1
+            stats['errors'] += 0 if ok else 1
+            stats['prompt_tokens'] += prompt_tokens
+            stats['output_tokens'] += output_tokens
+            stats['total_latency_ms'] += latency_ms
+            stats['max_latency_ms'] = max(stats['max_latency_ms'], latency_ms)
+            stats['estimated_tokens'] = stats['estimated_tokens'] or estimated
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                call: {
+                    'model': s['model'],
+                    'calls': s['calls'],
+                    'errors': s['errors'],
+                    'avg_prompt_tokens': round(s['prompt_tokens'] / s['calls'], 1),
+                    'avg_output_tokens': round(s['output_tokens'] / s['calls'], 1),
+                    'total_tokens': s['prompt_tokens'] + s['output_tokens'],
+                    'avg_latency_ms': round(s['total_latency_ms'] / s['calls'], 2),
+                    'max_latency_ms': round(s['max_latency_ms'], 2),
+                    'estimated_tokens': s['estimated_tokens']
+                }
+                for call, s in self._calls.items()
+            }
+
+
+def usage_tokens(response, prompt: str) -> Tuple[int, int, bool]:
+    """(prompt tokens, output tokens, estimated?) for a model response"""
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is not None and getattr(usage, 'prompt_token_count', None):
+        return usage.prompt_token_count, getattr(usage, 'candidates_token_count', 0) or 0, False
+
+    try:
+        text = response.text
+    except Exception:  # blocked or empty candidates
+        text = ''
+    return estimate_tokens(prompt), estimate_tokens(text), True
@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Tuple
+
+
+class DedupedSearch:
+    """
+    Wraps a search function so each distinct query runs once.
+
+    Meant to live for one batch of ideas. Their generated queries overlap
+    heavily (the same big brands come up again and again), so the number of
+    searches grows with the distinct queries, not with the number of ideas. A
+    caller asking for a query that another thread is already running waits
+    for that result instead of sending a duplicate request.
+    """
+
+    def __init__(self, search: Callable[..., List[Dict]]):
+        self.search = search
+        self._results: Dict[Tuple[str, int], Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'requested': 0, 'searched': 0}
+
+    def __call__(self, query: str, count: int = 10) -> List[Dict]:
+        key = (' '.join(query.lower().split()), count)
+        with self._lock:
+            self.stats['requested'] += 1
+            future = self._results.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._results[key] = Future()
+                self.stats['searched'] += 1
+
+        if is_owner:
+            try:
+                future.set_result(self.search(query, count=count))
+            except Exception as e:
+                future.set_exception(e)
+
+        return future.result()
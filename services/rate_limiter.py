@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a caller could not get a token within its maximum wait"""
+
+
+class UpstreamRateLimited(RateLimitTimeout):
+    """
+    Raised when the provider itself answers 429. The local buckets cannot
+    prevent this when other hosts share the key or a daily quota runs out.
+    """
+
+
+class SharedRateLimiter:
+    """
+    Token-bucket rate limiter shared by every worker process on a host.
+
+    Bucket state lives in a small SQLite file, and each token grab runs in
+    an IMMEDIATE transaction, so gunicorn workers never hand out the same
+    token twice.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+
+        conn = self._connect()
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS buckets (
+                   name TEXT PRIMARY KEY,
+                   tokens REAL NOT NULL,
+                   updated_at REAL NOT NULL
+               )"""
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread, in autocommit mode"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def bucket(self, provider: str, api_key: str, rate: float, capacity: float,
+               max_wait: float) -> 'TokenBucket':
+        """
+        Get the bucket for a provider/API key pair.
+
+        The key is hashed so it never ends up in the state file.
+        """
+        key_id = hashlib.sha256((api_key or '').encode()).hexdigest()[:12]
+        return TokenBucket(self, f"{provider}:{key_id}", provider, rate, capacity, max_wait)
+
+    def take(self, name: str, rate: float, capacity: float, cost: float = 1) -> float:
+        """
+        Try to take `cost` tokens from a bucket.
+
+        A cost above `capacity` needs a full bucket and leaves it in debt, so
+        the whole cost is still paid off at `rate` before the next take.
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds until they are available
+        """
+        needed = min(cost, capacity)
+        conn = self._connect()
+        now = time.time()
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT tokens, updated_at FROM buckets WHERE name = ?', (name,)
+            ).fetchone()
+
+            if row is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, row[0] + max(now - row[1], 0) * rate)
+
+            if tokens >= needed:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (needed - tokens) / rate
+
+            conn.execute(
+                'INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)',
+                (name, tokens, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return wait
+
+    def refund(self, name: str, capacity: float, cost: float = 1):
+        """Give back tokens taken for work that was then not done (never above capacity)"""
+        self._connect().execute(
+            'UPDATE buckets SET tokens = MIN(?, tokens + ?) WHERE name = ?', (capacity, cost, name)
+        )
+
+    def record(self, provider: str, waited: float, timed_out: bool = False):
+        """Record how long a caller queued for a token"""
+        with self._stats_lock:
+            stats = self._stats.setdefault(provider, {
+                'calls': 0,
+                'waited_calls': 0,
+                'timeouts': 0,
+                'total_wait': 0.0,
+                'max_wait': 0.0
+            })
+            stats['calls'] += 1
+            stats['total_wait'] += waited
+            stats['max_wait'] = max(stats['max_wait'], waited)
+            if waited > 0:
+                stats['waited_calls'] += 1
+            if timed_out:
+                stats['timeouts'] += 1
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-provider wait time stats for this worker process"""
+        with self._stats_lock:
+            return {
+                provider: {
+                    'calls': s['calls'],
+                    'waited_calls': s['waited_calls'],
+                    'timeouts': s['timeouts'],
+                    'avg_wait_ms': round(s['total_wait'] / s['calls'] * 1000, 2) if s['calls'] else 0.0,
+                    'max_wait_ms': round(s['max_wait'] * 1000, 2)
+                }
+                for provider, s in self._stats.items()
+            }
+
+
+class TokenBucket:
+    """A single provider/API key bucket handed out by SharedRateLimiter"""
+
+    def __init__(self, limiter: SharedRateLimiter, name: str, provider: str,
+                 rate: float, capacity: float, max_wait: float):
+        self.limiter = limiter
+        self.name = name
+        self.provider = provider
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available.
+
+        Callers queue instead of being dropped, but never for longer than
+        max_wait seconds.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: if no token became available within max_wait
+        """
+        start = time.monotonic()
+        deadline = start + self.max_wait
+
+        while True:
+            wait = self.limiter.take(self.name, self.rate, self.capacity)
+            now = time.monotonic()
+
+            if wait == 0:
+                waited = now - start
+                self.limiter.record(self.provider, waited)
+                return waited
+
+            if now + wait > deadline:
+                self.limiter.record(self.provider, now - start, timed_out=True)
+                raise RateLimitTimeout(
+                    f"{self.provider} rate limit: no token within {self.max_wait}s"
+                )
+
+            time.sleep(wait)
+
+    async def acquire_async(self) -> float:
+        """Async counterpart of acquire() that yields to the event loop while queueing"""
+        start = time.monotonic()
+        deadline = start + self.max_wait
+
+        while True:
+            # take() may block on the SQLite write lock, so keep it off the event loop
+            wait = await asyncio.to_thread(self.limiter.take, self.name, self.rate, self.capacity)
+            now = time.monotonic()
+
+            if wait == 0:
+                waited = now - start
+                self.limiter.record(self.provider, waited)
+                return waited
+
+            if now + wait > deadline:
+                self.limiter.record(self.provider, now - start, timed_out=True)
+                raise RateLimitTimeout(
+                    f"{self.provider} rate limit: no token within {self.max_wait}s"
+                )
+
+            await asyncio.sleep(wait)
@@ -0,0 +1,119 @@
+import re
+from typing import Dict, List
+
+import numpy as np
+
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Byte table that keeps [a-z0-9] and the document separator, and blanks everything else
+DOC_SEPARATOR = b'\x01'
+TOKEN_BYTES = bytes(
+    c if (ord('a') <= c <= ord('z') or ord('0') <= c <= ord('9') or c == DOC_SEPARATOR[0]) else ord(' ')
+    for c in range(256)
+)
+
+STOPWORDS = {
+    'the', 'and', 'for', 'that', 'with', 'this', 'which', 'who', 'where', 'when', 'your',
+    'you', 'their', 'they', 'them', 'from', 'into', 'can', 'will', 'are', 'has', 'have',
+    'its', 'not', 'but', 'all', 'any', 'more', 'most', 'very', 'also', 'our', 'was', 'get',
+    'one', 'out', 'how', 'what', 'about', 'than', 'then', 'there', 'here', 'just', 'like'
+}
+
+
+def normalize_token(token: str):
+    """Fold plurals ("dogs" -> "dog"); returns None for stopwords and short tokens"""
+    if len(token) < 3 or token in STOPWORDS:
+        return None
+    if token.endswith('ies') and len(token) > 4:
+        return token[:-3] + 'y'
+    if token.endswith('s') and not token.endswith('ss') and len(token) > 3:
+        return token[:-1]
+    return token
+
+
+DOC_BREAK = -2
+DROPPED = -1
+
+
+class _TokenIds(dict):
+    """Raw token bytes -> hashed feature id cache, filled on first sight of a token"""
+
+    def __init__(self, mask: int):
+        super().__init__({DOC_SEPARATOR: DOC_BREAK})
+        self.mask = mask
+
+    def __missing__(self, token: bytes) -> int:
+        normalized = normalize_token(token.decode())
+        token_id = DROPPED if normalized is None else hash(normalized) & self.mask
+        if len(self) < HashedTfidfScorer.MAX_CACHED_TOKENS:
+            self[token] = token_id
+        return token_id
+
+
+class HashedTfidfScorer:
+    """
+    Scores search results against an idea with hashed TF-IDF cosine similarity.
+
+    Each batch (the idea plus every candidate result) is turned into sparse
+    hashed term vectors, and all cosine similarities are computed in one go
+    with NumPy. Whole words are matched, so "cook" no longer matches "cookie".
+    """
+
+    MAX_CACHED_TOKENS = 50000
+
+    def __init__(self, threshold: float = 0.12, n_features: int = 2 ** 20):
+        self.threshold = threshold
+        self.mask = n_features - 1
+        self._token_ids = _TokenIds(self.mask)
+
+    def score(self, idea: str, results: List[Dict]) -> np.ndarray:
+        """Cosine similarity between the idea and each result (title + description)"""
+        if not results:
+            return np.zeros(0)
+
+        docs = [idea] + [f"{r.get('title', '')} {r.get('description', '')}" for r in results]
+        # Clean each document on its own, so a stray '<' or '\x01' cannot move a document break
+        text = ' \x01 '.join(TAG_RE.sub(' ', doc.replace('\x01', ' ')) for doc in docs).lower()
+
+        # Tokenize the whole batch in one pass; separator tokens mark document breaks.
+        # Python's hash is stable within a process, which is all a batch needs.
+        tokens = text.encode('ascii', 'ignore').translate(TOKEN_BYTES).split()
+        ids = np.fromiter(map(self._token_ids.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        doc_ids = np.cumsum(ids == DOC_BREAK)
+        keep = ids >= 0
+        term_ids, doc_ids = ids[keep], doc_ids[keep]
+
+        if term_ids.size == 0:
+            return np.zeros(len(results))
+
+        n_docs = len(docs)
+        keys = doc_ids * (self.mask + 1) + term_ids
+        keys, tf = np.unique(keys, return_counts=True)
+        doc = keys // (self.mask + 1)
+        term = keys % (self.mask + 1)
+
+        # Smoothed IDF over the batch, sublinear TF
+        terms, df = np.unique(term, return_counts=True)
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+        weight = (1 + np.log(tf)) * idf[np.searchsorted(terms, term)]
+
+        norms = np.sqrt(np.bincount(doc, weights=weight ** 2, minlength=n_docs))
+
+        # Dot products of every result with the idea vector (doc 0)
+        is_idea = doc == 0
+        idea_terms, idea_weights = term[is_idea], weight[is_idea]  # sorted, since keys are
+        if idea_terms.size == 0:
+            return np.zeros(len(results))
+
+        pos = np.clip(np.searchsorted(idea_terms, term), 0, idea_terms.size - 1)
+        shared = (idea_terms[pos] == term) & ~is_idea
+        dots = np.bincount(doc[shared], weights=weight[shared] * idea_weights[pos[shared]], minlength=n_docs)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sims = dots[1:] / (norms[1:] * norms[0])
+        return np.nan_to_num(sims)
+
+    def filter(self, idea: str, results: List[Dict]) -> List[Dict]:
+        """Keep the results whose similarity to the idea reaches the threshold"""
+        scores = self.score(idea, results)
+        return [r for r, s in zip(results, scores) if s >= self.threshold]
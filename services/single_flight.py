@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: coalesce within the process only
+    fcntl = None
+
+
+class _Call:
+    """An in-flight call that other threads can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key, so only the first one does the work.
+
+    Threads in the same worker wait on the leader's in-memory result. Other
+    workers on the host queue on a per-key file lock, and the leader leaves
+    its result in the lock file for them to pick up.
+    """
+
+    SWEEP_INTERVAL = 3600
+
+    def __init__(self, lock_dir: str, result_ttl: float = 30, lock_timeout: float = 60):
+        self.lock_dir = lock_dir
+        self.result_ttl = result_ttl
+        self.lock_timeout = lock_timeout
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self.stats = {'leaders': 0, 'coalesced_local': 0, 'coalesced_shared': 0}
+        os.makedirs(lock_dir, exist_ok=True)
+
+    def do(self, key: str, fn: Callable[[], Any],
+           shareable: Callable[[Any], bool] = lambda result: True) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Coalescing key (e.g. the normalized idea text)
+            fn: Work to run; its result must be JSON-serializable
+            shareable: Decides whether a result may be handed to other workers
+
+        Returns:
+            The leader's result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.stats['coalesced_local'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_shared(key, fn, shareable)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]],
+                       shareable: Callable[[Any], bool] = lambda result: True) -> Any:
+        """
+        Async counterpart of do() for the ASGI serving mode.
+
+        Coroutines in the same event loop await the leader's future; other
+        workers coordinate through the same per-key lock files as do().
+        """
+        call = self._async_calls.get(key)
+        if call is not None:
+            self.stats['coalesced_local'] += 1
+            return await asyncio.shield(call)
+
+        call = asyncio.get_running_loop().create_future()
+        self._async_calls[key] = call
+
+        try:
+            result = await self._run_shared_async(key, fn, shareable)
+            call.set_result(result)
+            return result
+        except BaseException as e:
+            call.set_exception(e)
+            call.exception()  # followers re-raise it; don't warn when there are none
+            raise
+        finally:
+            del self._async_calls[key]
+
+    def _run_shared(self, key: str, fn: Callable[[], Any], shareable: Callable[[Any], bool]) -> Any:
+        """Run fn under the cross-worker lock, reusing a fresh result if one exists"""
+        if fcntl is None:
+            self.stats['leaders'] += 1
+            return fn()
+
+        # The lock file doubles as the result slot for followers in other workers
+        with open(self._flight_path(key), 'a+') as f:
+            locked = self._lock_file(f)
+            try:
+                cached = self._read_result(f)
+                if cached is not None:
+                    self.stats['coalesced_shared'] += 1
+                    return cached
+
+                self.stats['leaders'] += 1
+                result = fn()
+
+                if locked and shareable(result):
+                    self._write_result(f, result)
+                return result
+            finally:
+                if locked:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                self._sweep()
+
+    async def _run_shared_async(self, key: str, fn: Callable[[], Awaitable[Any]],
+                                shareable: Callable[[Any], bool]) -> Any:
+        """Async counterpart of _run_shared; waits for the file lock off the event loop"""
+        if fcntl is None:
+            self.stats['leaders'] += 1
+            return await fn()
+
+        with open(self._flight_path(key), 'a+') as f:
+            locked = await asyncio.to_thread(self._lock_file, f)
+            try:
+                cached = self._read_result(f)
+                if cached is not None:
+                    self.stats['coalesced_shared'] += 1
+                    return cached
+
+                self.stats['leaders'] += 1
+                result = await fn()
+
+                if locked and shareable(result):
+                    self._write_result(f, result)
+                return result
+            finally:
+                if locked:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                self._sweep()
+
+    def _flight_path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.lock_dir, f"{digest}.flight")
+
+    def _lock_file(self, f) -> bool:
+        """Wait for the per-key lock; gives up (and runs unlocked) after lock_timeout"""
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.05)
+
+    def _read_result(self, f) -> Optional[Any]:
+        try:
+            if time.time() - os.fstat(f.fileno()).st_mtime > self.result_ttl:
+                return None
+            f.seek(0)
+            data = f.read()
+            return json.loads(data) if data else None
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_result(f, result: Any):
+        f.seek(0)
+        f.truncate()
+        json.dump(result, f)
+        f.flush()
+
+    def _sweep(self):
+        """Every so often, delete flight files for keys nobody has asked about in a while"""
+        now = time.time()
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+
+        try:
+            for name in os.listdir(self.lock_dir):
+                path = os.path.join(self.lock_dir, name)
+                if name.endswith('.flight') and now - os.path.getmtime(path) > self.SWEEP_INTERVAL:
+                    os.remove(path)
+        except OSError:
+            pass
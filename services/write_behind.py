@@ -0,0 +1,207 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process spool recovery
+    fcntl = None
+
+
+class _SpoolFile:
+    """An append-only JSONL spool file, flock-ed for as long as this process owns it"""
+
+    def __init__(self, path: str, create: bool = False):
+        self.path = path
+        # A new spool is locked under a temporary name and then renamed, so
+        # recovery never sees (and claims) it before its owner holds the lock
+        self.file = open(path + '.tmp' if create else path, 'a')
+        if fcntl:
+            try:
+                fcntl.flock(self.file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.file.close()
+                raise
+        if create:
+            os.rename(path + '.tmp', path)
+
+    def append(self, record: Dict, fsync: bool):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+        if fsync:
+            os.fsync(self.file.fileno())
+
+    def remove(self):
+        os.remove(self.path)
+        self.file.close()
+
+
+class IdeaWriteBehind:
+    """
+    Write-behind buffer for Idea inserts.
+
+    enqueue() appends the row to a local spool file (fsync-ed) and returns,
+    so the request never waits on the database. A background thread flushes
+    buffered rows to the DB in one multi-row transaction once batch_size rows
+    are waiting or flush_interval seconds have passed. Spool files left by a
+    crashed worker are picked up and flushed by the next worker to start.
+    """
+
+    def __init__(self, spool_dir: str, flush_rows: Callable[[List[Dict]], None],
+                 batch_size: int = 50, flush_interval: float = 2.0, fsync: bool = True):
+        self.spool_dir = spool_dir
+        self.flush_rows = flush_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._buffer: List[Dict] = []
+        self._spool: Optional[_SpoolFile] = None
+        self._pending = []  # (spool file, rows) batches waiting to be written
+        self._seq = 0
+        self._stopping = False
+        self._thread = None
+        self.pid = os.getpid()  # a forked child must create its own writer (and flusher thread)
+        self.stats = {'enqueued': 0, 'flushed': 0, 'flushes': 0, 'flush_failures': 0,
+                      'recovered': 0, 'last_flush_ms': None}
+
+        os.makedirs(spool_dir, exist_ok=True)
+
+    def start(self):
+        """Recover orphaned spools, then start the flusher thread"""
+        self._recover_orphans()
+        self._thread = threading.Thread(target=self._run, name='idea-write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def enqueue(self, idea_text: str, created_at: Optional[datetime] = None):
+        """Durably buffer one Idea row"""
+        record = {
+            'idea_text': idea_text,
+            'created_at': (created_at or datetime.utcnow()).isoformat()
+        }
+
+        with self._lock:
+            if self._spool is None:
+                self._spool = _SpoolFile(self._new_spool_path(), create=True)
+            self._spool.append(record, self.fsync)
+            self._buffer.append(record)
+            self.stats['enqueued'] += 1
+
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.notify()
+
+    def flush(self):
+        """Write every buffered and pending row to the database"""
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            if self._buffer:
+                self._pending.append((self._spool, self._buffer))
+                self._spool = None
+                self._buffer = []
+            pending = list(self._pending)
+
+        for spool, rows in pending:
+            start = time.monotonic()
+            try:
+                self.flush_rows([self._to_row(r) for r in rows])
+            except Exception as e:
+                # Leave this batch (and its spool) for the next attempt
+                self.stats['flush_failures'] += 1
+                print(f"Error flushing buffered ideas: {e}")
+                return
+
+            spool.remove()
+            with self._lock:
+                self._pending.remove((spool, rows))
+            self.stats['flushes'] += 1
+            self.stats['flushed'] += len(rows)
+            self.stats['last_flush_ms'] = round((time.monotonic() - start) * 1000, 2)
+
+    def stop(self):
+        """Stop the flusher thread and flush whatever is left (runs at exit)"""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.flush()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self.stats,
+                'buffered': len(self._buffer),
+                'pending_batches': len(self._pending)
+            }
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(
+                    lambda: self._stopping or len(self._buffer) >= self.batch_size,
+                    timeout=self.flush_interval
+                )
+                if self._stopping:
+                    return
+                has_work = bool(self._buffer or self._pending)
+
+            if has_work:
+                self.flush()
+
+    def _new_spool_path(self) -> str:
+        self._seq += 1
+        return os.path.join(self.spool_dir, f"ideas-{os.getpid()}-{time.time_ns()}-{self._seq}.jsonl")
+
+    def _recover_orphans(self):
+        """Claim spool files whose owning process is gone (their flock is free)"""
+        if fcntl is None:
+            return
+
+        # Temporary files of spools whose creator died before renaming them hold no rows
+        for path in glob.glob(os.path.join(self.spool_dir, 'ideas-*.jsonl.tmp')):
+            try:
+                if time.time() - os.path.getmtime(path) > 60:
+                    _SpoolFile(path).remove()
+            except (BlockingIOError, FileNotFoundError):
+                continue
+
+        for path in glob.glob(os.path.join(self.spool_dir, 'ideas-*.jsonl')):
+            try:
+                spool = _SpoolFile(path)
+            except BlockingIOError:
+                continue  # still owned by a live worker, or claimed by another one
+
+            rows = []
+            with open(path) as f:
+                for line in f:
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        pass  # torn final line from the crash
+
+            if rows:
+                with self._lock:
+                    self._pending.append((spool, rows))
+                self.stats['recovered'] += len(rows)
+                print(f"Recovered {len(rows)} buffered ideas from {os.path.basename(path)}")
+            else:
+                spool.remove()
+
+    @staticmethod
+    def _to_row(record: Dict) -> Dict:
+        return {
+            'idea_text': record['idea_text'],
+            'created_at': datetime.fromisoformat(record['created_at'])
+        }
@@ -0,0 +1,65 @@
+"""Train the local generic-idea classifier from logged Gemini verdicts"""
+import argparse
+import random
+import sys
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('logs', nargs='*', help='verdict log files (default: GENERIC_VERDICT_LOG)')
+parser.add_argument('--min-samples', type=int, default=200, help='refuse to train on fewer distinct ideas')
+parser.add_argument('--holdout', type=float, default=0.2, help='fraction of ideas held out for evaluation')
+parser.add_argument('--epochs', type=int, default=300)
+args = parser.parse_args()
+
+print("=" * 50)
+print("Training generic idea classifier...")
+print("=" * 50)
+
+try:
+    from config import Config
+    from services.generic_classifier import GenericIdeaClassifier, VerdictLog
+
+    logs = args.logs or [Config.GENERIC_VERDICT_LOG]
+
+    print("\n1. Reading verdict logs...")
+    verdicts = VerdictLog.read(logs)
+    positives = sum(verdicts.values())
+    print(f"   ✓ {len(verdicts)} distinct ideas ({positives} generic, {len(verdicts) - positives} not)")
+    if len(verdicts) < args.min_samples:
+        raise ValueError(f"Need at least {args.min_samples} distinct ideas to train (see --min-samples)")
+
+    items = sorted(verdicts.items())
+    random.Random(0).shuffle(items)
+    split = int(len(items) * (1 - args.holdout))
+    train, holdout = items[:split], items[split:]
+
+    print("\n2. Training on held-in ideas...")
+    classifier = GenericIdeaClassifier.train(
+        [text for text, _ in train], [label for _, label in train], epochs=args.epochs
+    )
+    classifier.confidence = Config.GENERIC_CLASSIFIER_CONFIDENCE
+    evaluation = classifier.evaluate([text for text, _ in holdout], [label for _, label in holdout])
+    print(f"   ✓ Holdout accuracy: {evaluation['accuracy']} on {evaluation['samples']} ideas")
+    print(f"   ✓ At confidence {classifier.confidence}: {evaluation['coverage']} answered locally, "
+          f"accuracy {evaluation['confident_accuracy']}")
+
+    print("\n3. Retraining on all ideas and saving...")
+    classifier = GenericIdeaClassifier.train(
+        [text for text, _ in items], [label for _, label in items], epochs=args.epochs
+    )
+    path = classifier.save(Config.GENERIC_CLASSIFIER_DIR, {'samples': len(items), 'holdout': evaluation})
+    print(f"   ✓ Saved {path}")
+
+    print("\n" + "=" * 50)
+    print(f"Classifier v{classifier.version} trained successfully! Restart the app to load it.")
+    print("=" * 50)
+    sys.exit(0)
+
+except Exception as e:
+    print("\n" + "=" * 50)
+    print("ERROR during training:")
+    print("=" * 50)
+    print(f"\n{type(e).__name__}: {e}")
+    import traceback
+    traceback.print_exc()
+    print("\n" + "=" * 50)
+    sys.exit(1)
@@ -1,7 +1,10 @@
 """WSGI entry point for production deployment"""
-from app import app
+from app import app, recover_buffered_ideas
 
 # Note: Database initialization is handled by build.sh
 
+# Flush ideas buffered by a worker that crashed before writing them
+recover_buffered_ideas()
+
 if __name__ == "__main__":
     app.run()